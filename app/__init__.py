@@ -30,6 +30,10 @@ def create_app(config_name=None):
     # ── JSON encoding: preserve emoji / Unicode in responses ────────────
     app.config['JSON_AS_ASCII'] = False
     
+    # orjson-backed jsonify() when available (falls back to stdlib json)
+    from app.utils.json_provider import get_json_provider_class
+    app.json = get_json_provider_class()(app)
+    
     # Get database URL from environment
     database_url = (
         os.environ.get('DATABASE_URL') 
@@ -44,6 +48,8 @@ def create_app(config_name=None):
     if config_name == 'testing':
         app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///:memory:'
         app.config['TESTING'] = True
+        # Each test builds its own data; don't serve searches cached by another
+        app.config['SEARCH_CACHE_TTL_SECONDS'] = 0
     elif database_url:
         # Production/Render - use the environment database URL
         app.config['SQLALCHEMY_DATABASE_URI'] = database_url
@@ -183,6 +189,145 @@ def create_app(config_name=None):
                 except Exception as e:
                     print(f"[STARTUP] supabase_user_id migration note: {e}")
             
+            # MIGRATION: Add normalized search_text column to task_requests and backfill it
+            # Backfilled with plain SQL: an ORM query would select every mapped
+            # column, including ones later blocks (geohash) have not added yet
+            if not app.config.get('TESTING', False):
+                try:
+                    task_columns = [col['name'] for col in inspector.get_columns('task_requests')]
+                    if 'search_text' not in task_columns:
+                        print("[STARTUP] Adding search_text column to task_requests table...")
+                        db.session.execute(db.text(
+                            'ALTER TABLE task_requests ADD COLUMN search_text TEXT'
+                        ))
+                        db.session.commit()
+                        print("[STARTUP] ✓ Added search_text column")
+                    
+                    from app.utils.search_text import build_search_text
+                    backfilled = 0
+                    while True:
+                        missing = db.session.execute(db.text(
+                            'SELECT id, title, description FROM task_requests '
+                            'WHERE search_text IS NULL ORDER BY id LIMIT 500'
+                        )).fetchall()
+                        if not missing:
+                            break
+                        db.session.execute(db.text(
+                            'UPDATE task_requests SET search_text = :search_text WHERE id = :id'
+                        ), [
+                            {'id': row.id, 'search_text': build_search_text(row.title, row.description)}
+                            for row in missing
+                        ])
+                        db.session.commit()
+                        backfilled += len(missing)
+                    if backfilled:
+                        print(f"[STARTUP] ✓ Backfilled search_text for {backfilled} tasks")
+                    
+                    task_indexes = [idx['name'] for idx in inspector.get_indexes('task_requests')]
+                    if (db.engine.dialect.name == 'postgresql'
+                            and 'ix_task_requests_search_text_trgm' not in task_indexes):
+                        db.session.execute(db.text('CREATE EXTENSION IF NOT EXISTS pg_trgm'))
+                        db.session.execute(db.text(
+                            'CREATE INDEX IF NOT EXISTS ix_task_requests_search_text_trgm '
+                            'ON task_requests USING gin (search_text gin_trgm_ops)'
+                        ))
+                        db.session.commit()
+                        print("[STARTUP] ✓ Added search_text trigram index")
+                except Exception as e:
+                    db.session.rollback()
+                    print(f"[STARTUP] search_text migration note: {e}")
+            
+            # MIGRATION: Add normalized search_text column to translation_cache and backfill it
+            if not app.config.get('TESTING', False):
+                try:
+                    from app.models import TranslationCache
+                    translation_columns = [col['name'] for col in inspector.get_columns('translation_cache')]
+                    if 'search_text' not in translation_columns:
+                        print("[STARTUP] Adding search_text column to translation_cache table...")
+                        db.session.execute(db.text(
+                            'ALTER TABLE translation_cache ADD COLUMN search_text TEXT'
+                        ))
+                        db.session.commit()
+                        print("[STARTUP] ✓ Added translation search_text column")
+                    
+                    from app.utils.search_text import build_translation_search_text
+                    backfilled = 0
+                    while True:
+                        missing = TranslationCache.query.filter(
+                            TranslationCache.search_text.is_(None)
+                        ).limit(500).all()
+                        if not missing:
+                            break
+                        for translation in missing:
+                            translation.search_text = build_translation_search_text(
+                                translation.translated_text
+                            )
+                        db.session.commit()
+                        backfilled += len(missing)
+                    if backfilled:
+                        print(f"[STARTUP] ✓ Backfilled search_text for {backfilled} translations")
+                    
+                    translation_indexes = [idx['name'] for idx in inspector.get_indexes('translation_cache')]
+                    if (db.engine.dialect.name == 'postgresql'
+                            and 'ix_translation_cache_search_text_trgm' not in translation_indexes):
+                        db.session.execute(db.text('CREATE EXTENSION IF NOT EXISTS pg_trgm'))
+                        db.session.execute(db.text(
+                            'CREATE INDEX IF NOT EXISTS ix_translation_cache_search_text_trgm '
+                            'ON translation_cache USING gin (search_text gin_trgm_ops)'
+                        ))
+                        db.session.commit()
+                        print("[STARTUP] ✓ Added translation search_text trigram index")
+                except Exception as e:
+                    db.session.rollback()
+                    print(f"[STARTUP] translation search_text migration note: {e}")
+            
+            # MIGRATION: Add geohash column to task_requests and backfill it
+            if not app.config.get('TESTING', False):
+                try:
+                    task_columns = [col['name'] for col in inspector.get_columns('task_requests')]
+                    if 'geohash' not in task_columns:
+                        print("[STARTUP] Adding geohash column to task_requests table...")
+                        db.session.execute(db.text(
+                            'ALTER TABLE task_requests ADD COLUMN geohash VARCHAR(7)'
+                        ))
+                        db.session.commit()
+                        print("[STARTUP] ✓ Added geohash column")
+                    
+                    task_indexes = [idx['name'] for idx in inspector.get_indexes('task_requests')]
+                    if 'ix_task_requests_geohash_status' not in task_indexes:
+                        pattern_ops = ' varchar_pattern_ops' if db.engine.dialect.name == 'postgresql' else ''
+                        db.session.execute(db.text(
+                            'CREATE INDEX IF NOT EXISTS ix_task_requests_geohash_status '
+                            f'ON task_requests (geohash{pattern_ops}, status)'
+                        ))
+                        db.session.execute(db.text('DROP INDEX IF EXISTS ix_task_requests_geohash'))
+                        db.session.commit()
+                        print("[STARTUP] ✓ Added geohash prefix index")
+                    
+                    from app.utils.geohash import encode as encode_geohash
+                    backfilled = 0
+                    while True:
+                        missing = db.session.execute(db.text(
+                            'SELECT id, latitude, longitude FROM task_requests '
+                            'WHERE geohash IS NULL AND latitude IS NOT NULL AND longitude IS NOT NULL '
+                            'ORDER BY id LIMIT 500'
+                        )).fetchall()
+                        if not missing:
+                            break
+                        db.session.execute(db.text(
+                            'UPDATE task_requests SET geohash = :geohash WHERE id = :id'
+                        ), [
+                            {'id': row.id, 'geohash': encode_geohash(row.latitude, row.longitude)}
+                            for row in missing
+                        ])
+                        db.session.commit()
+                        backfilled += len(missing)
+                    if backfilled:
+                        print(f"[STARTUP] ✓ Backfilled geohash for {backfilled} tasks")
+                except Exception as e:
+                    db.session.rollback()
+                    print(f"[STARTUP] geohash migration note: {e}")
+            
             # MIGRATION: Rename revolut_order_id -> stripe_session_id in payments table
             if not app.config.get('TESTING', False):
                 try:
@@ -4,6 +4,8 @@ Must stay in sync with:
   frontend: packages/shared/src/constants/categories.ts
 """
 
+from functools import lru_cache
+
 # The 15 valid category keys (excluding 'all' which is filter-only)
 VALID_CATEGORIES = {
     'cleaning',
@@ -76,9 +78,12 @@ def normalize_category(category: str) -> str:
     return LEGACY_CATEGORY_MAP.get(key, key)
 
 
+@lru_cache(maxsize=256)
 def validate_category(category: str) -> tuple[str, str | None]:
     """Validate and normalize a category.
 
+    Pure function of its input, so results are memoized.
+
     Returns:
         (normalized_key, error_message)
         error_message is None when valid.
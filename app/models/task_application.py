@@ -7,6 +7,13 @@ class TaskApplication(db.Model):
     
     __table_args__ = (
         db.UniqueConstraint('task_id', 'applicant_id', name='unique_task_application'),
+        # Pending-count subqueries only ever look at pending rows
+        db.Index(
+            'ix_task_applications_task_status', 'task_id', 'status',
+            postgresql_where=db.text("status = 'pending'")
+        ),
+        # has_applied / "my applications" lookups lead with the applicant
+        db.Index('ix_task_applications_applicant_task', 'applicant_id', 'task_id'),
     )
     
     id = db.Column(db.Integer, primary_key=True)
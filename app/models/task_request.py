@@ -1,7 +1,10 @@
 """Task Request model for quick help services."""
 
 from datetime import datetime
+from sqlalchemy import event
 from app import db
+from app.utils.geohash import GEOHASH_PRECISION, encode as encode_geohash
+from app.utils.search_text import build_search_text
 
 
 class TaskRequest(db.Model):
@@ -9,9 +12,26 @@ class TaskRequest(db.Model):
     
     __tablename__ = 'task_requests'
     
+    __table_args__ = (
+        # Feed filter: status + optional category
+        db.Index('ix_task_requests_status_category', 'status', 'category'),
+        # Geohash prefix search (LIKE 'abc%') + status; pattern ops let
+        # PostgreSQL use the index for LIKE under a non-C collation
+        db.Index(
+            'ix_task_requests_geohash_status', 'geohash', 'status',
+            postgresql_ops={'geohash': 'varchar_pattern_ops'}
+        ),
+        # Open-task feed: category filter, newest first; only open rows
+        db.Index(
+            'ix_task_requests_open_feed', 'category', db.text('created_at DESC'),
+            postgresql_where=db.text("status = 'open'")
+        ),
+    )
+    
     id = db.Column(db.Integer, primary_key=True)
     title = db.Column(db.String(255), nullable=False, index=True)
     description = db.Column(db.Text, nullable=False)
+    search_text = db.Column(db.Text, nullable=True)  # Normalized title + description for search
     category = db.Column(db.String(50), nullable=False, index=True)  # 'delivery', 'cleaning', 'repair', 'tutoring', etc.
     budget = db.Column(db.Float, nullable=True)
     currency = db.Column(db.String(3), default='EUR', nullable=False)
@@ -19,6 +39,7 @@ class TaskRequest(db.Model):
     location = db.Column(db.String(255), nullable=False)
     latitude = db.Column(db.Float, nullable=False)
     longitude = db.Column(db.Float, nullable=False)
+    geohash = db.Column(db.String(GEOHASH_PRECISION), nullable=True)  # Derived from latitude/longitude
     creator_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False, index=True)
     assigned_to_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=True, index=True)
     radius = db.Column(db.Float, default=5.0, nullable=False)  # Search radius in km
@@ -140,3 +161,26 @@ class TaskRequest(db.Model):
     
     def __repr__(self):
         return f'<TaskRequest {self.id}: {self.title}>'
+
+
+@event.listens_for(TaskRequest, 'before_insert')
+@event.listens_for(TaskRequest, 'before_update')
+def _sync_geohash(mapper, connection, target):
+    """Keep the geohash cell in sync with the task coordinates.
+    
+    Coordinates from a JSON body may arrive as strings ("56.9"), which the
+    database coerces; convert them the same way here.
+    """
+    if target.latitude is None or target.longitude is None:
+        return
+    try:
+        target.geohash = encode_geohash(float(target.latitude), float(target.longitude))
+    except (TypeError, ValueError):
+        target.geohash = None
+
+
+@event.listens_for(TaskRequest, 'before_insert')
+@event.listens_for(TaskRequest, 'before_update')
+def _sync_search_text(mapper, connection, target):
+    """Keep the normalized search text in sync with title and description."""
+    target.search_text = build_search_text(target.title, target.description)
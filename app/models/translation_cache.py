@@ -1,5 +1,7 @@
 """Translation cache model for storing translated content."""
+from sqlalchemy import event
 from app import db
+from app.utils.search_text import build_translation_search_text
 
 
 class TranslationCache(db.Model):
@@ -12,8 +14,16 @@ class TranslationCache(db.Model):
     target_lang = db.Column(db.String(5), nullable=False)
     original_text = db.Column(db.Text, nullable=False)
     translated_text = db.Column(db.Text, nullable=False)
+    search_text = db.Column(db.Text, nullable=True)  # Normalized translated_text for search
     created_at = db.Column(db.DateTime, default=db.func.now())
     
     __table_args__ = (
         db.UniqueConstraint('text_hash', 'target_lang', name='unique_translation'),
     )
+
+
+@event.listens_for(TranslationCache, 'before_insert')
+@event.listens_for(TranslationCache, 'before_update')
+def _sync_search_text(mapper, connection, target):
+    """Keep the normalized search text in sync with the translation."""
+    target.search_text = build_translation_search_text(target.translated_text)
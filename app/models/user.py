@@ -14,6 +14,9 @@ DEFAULT_JOB_ALERT_PREFERENCES = {
     'categories': [],  # empty = all categories
 }
 
+# Largest radius_km a user can set for job alerts
+MAX_JOB_ALERT_RADIUS_KM = 50
+
 
 class User(db.Model):
     """User model for marketplace platform."""
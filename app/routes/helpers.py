@@ -40,3 +40,23 @@ def validate_price_range(value, field_name='Price'):
         return jsonify({'error': f'{field_name} must be between \u20ac{MIN_PRICE} and \u20ac{MAX_PRICE:,}'}), 400
     
     return None
+
+
+def validate_coordinates(latitude, longitude):
+    """Validate that a search point lies within latitude/longitude range.
+    
+    Args:
+        latitude: Latitude in degrees (float), must be in [-90, 90]
+        longitude: Longitude in degrees (float), must be in [-180, 180]
+    
+    Returns:
+        A Flask JSON error response tuple (jsonify, status_code) if validation fails,
+        or None if the coordinates are valid.
+    """
+    # Written so NaN fails the checks too
+    if not -90 <= latitude <= 90:
+        return jsonify({'error': 'Latitude must be between -90 and 90'}), 400
+    if not -180 <= longitude <= 180:
+        return jsonify({'error': 'Longitude must be between -180 and 180'}), 400
+    
+    return None
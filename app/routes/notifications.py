@@ -1,9 +1,11 @@
 """Notification routes for user notifications."""
 
+import json
 import traceback
 from flask import Blueprint, request, jsonify
 from app import db
 from app.models import Notification, NotificationType
+from app.models.user import MAX_JOB_ALERT_RADIUS_KM
 from app.utils import token_required
 from datetime import datetime
 
@@ -282,8 +284,8 @@ def update_job_alert_preferences(current_user_id):
         
         if 'radius_km' in data:
             radius = data['radius_km']
-            if not isinstance(radius, (int, float)) or radius < 1 or radius > 50:
-                return jsonify({'error': 'radius_km must be a number between 1 and 50'}), 400
+            if not isinstance(radius, (int, float)) or radius < 1 or radius > MAX_JOB_ALERT_RADIUS_KM:
+                return jsonify({'error': f'radius_km must be a number between 1 and {MAX_JOB_ALERT_RADIUS_KM}'}), 400
             prefs['radius_km'] = radius
         
         if 'categories' in data:
@@ -317,6 +319,26 @@ def update_job_alert_preferences(current_user_id):
 
 # ============ HELPER FUNCTIONS FOR CREATING NOTIFICATIONS ============
 
+def notification_values(user_id: int, notification_type: str, title: str, message: str,
+                        related_type: str = None, related_id: int = None,
+                        data: dict = None) -> dict:
+    """Column values for a Notification, as a plain dict.
+    
+    For fan-outs that insert many notifications at once with
+    db.session.execute(insert(Notification), rows). Arguments as for
+    create_notification().
+    """
+    return {
+        'user_id': user_id,
+        'type': notification_type,
+        'title': title,
+        'message': message,
+        'related_type': related_type,
+        'related_id': related_id,
+        'data': json.dumps(data) if data else None,
+    }
+
+
 def create_notification(user_id: int, notification_type: str, title: str, message: str, 
                        related_type: str = None, related_id: int = None,
                        data: dict = None) -> Notification:
@@ -334,18 +356,10 @@ def create_notification(user_id: int, notification_type: str, title: str, messag
     Returns:
         The created Notification object
     """
-    notification = Notification(
-        user_id=user_id,
-        type=notification_type,
-        title=title,
-        message=message,
-        related_type=related_type,
-        related_id=related_id
-    )
-    
-    if data:
-        notification.set_data(data)
-    
+    notification = Notification(**notification_values(
+        user_id, notification_type, title, message,
+        related_type=related_type, related_id=related_id, data=data
+    ))
     db.session.add(notification)
     return notification
 
@@ -478,6 +492,21 @@ def notify_new_task_nearby(user_id: int, task_title: str, task_id: int,
                            budget: str = None, location: str = None) -> Notification:
     """Create notification when a new task is posted near a user with job alerts on.
     
+    Arguments as for new_task_nearby_values().
+    """
+    notification = Notification(**new_task_nearby_values(
+        user_id, task_title, task_id, category_key, distance_km,
+        budget=budget, location=location
+    ))
+    db.session.add(notification)
+    return notification
+
+
+def new_task_nearby_values(user_id: int, task_title: str, task_id: int,
+                           category_key: str, distance_km: float,
+                           budget: str = None, location: str = None) -> dict:
+    """Column values (see notification_values()) for a new_task_nearby notification.
+    
     Args:
         user_id: The user to notify
         task_title: Title of the new task
@@ -488,7 +517,7 @@ def notify_new_task_nearby(user_id: int, task_title: str, task_id: int,
         location: Optional location name
     """
     dist_display = f'{distance_km:.1f} km'
-    return create_notification(
+    return notification_values(
         user_id=user_id,
         notification_type=NotificationType.NEW_TASK_NEARBY,
         title=f'\U0001f4cd New {category_key} task nearby',
@@ -17,7 +17,8 @@ from app.routes.tasks.helpers import (
     get_bounding_box,
     distance,
     translate_task_if_needed,
-    get_pending_applications_count
+    get_pending_applications_count,
+    get_pending_applications_counts
 )
 
 # Import and register all route modules
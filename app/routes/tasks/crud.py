@@ -1,7 +1,7 @@
 """Basic CRUD operations for tasks."""
 
 from flask import request, jsonify
-from sqlalchemy.orm import joinedload
+from sqlalchemy.orm import joinedload, raiseload
 from sqlalchemy import func, case
 from app import db
 from app.models import TaskRequest, User, TaskApplication
@@ -9,11 +9,17 @@ from app.utils import token_required
 from app.utils.auth import _resolve_user_from_token
 from app.routes.tasks import tasks_bp
 from app.routes.tasks.helpers import (
-    get_bounding_box,
-    distance,
+    geohash_filter,
+    distance_expr,
     translate_task_if_needed,
+    batch_translate_tasks,
+    get_pending_applications_count,
+    pending_applications_count_column,
+    has_applied_column,
+    task_user_load_options,
+    premium_tier_expr,
 )
-from app.routes.helpers import validate_price_range
+from app.routes.helpers import validate_price_range, validate_coordinates
 from app.constants.categories import validate_category, normalize_category
 from datetime import datetime
 import logging
@@ -23,6 +29,7 @@ logger = logging.getLogger(__name__)
 DEFAULT_RADIUS_KM = 25
 MIN_RESULTS_DEFAULT = 5
 RADIUS_EXPANSION_STEPS = [50, 100, 200, 500]
+TASK_DIFFICULTIES = ('easy', 'medium', 'hard')
 
 
 def get_current_user_id_optional():
@@ -36,102 +43,100 @@ def get_current_user_id_optional():
     return user_id
 
 
-def get_pending_applications_counts(task_ids: list[int]) -> dict[int, int]:
-    if not task_ids:
-        return {}
-    try:
-        results = db.session.query(
-            TaskApplication.task_id,
-            func.count(TaskApplication.id)
-        ).filter(
-            TaskApplication.task_id.in_(task_ids),
-            TaskApplication.status == 'pending'
-        ).group_by(TaskApplication.task_id).all()
-        counts = {task_id: 0 for task_id in task_ids}
-        for task_id, count in results:
-            counts[task_id] = count
-        return counts
-    except Exception as e:
-        logger.error(f"Error fetching application counts: {e}")
-        return {task_id: 0 for task_id in task_ids}
+def _task_list_columns(current_user_id):
+    """Per-task columns selected alongside each TaskRequest in list queries.
+    
+    has_applied is only selected for authenticated users; anonymous
+    requests skip the EXISTS entirely.
+    """
+    columns = [pending_applications_count_column()]
+    if current_user_id is not None:
+        columns.append(has_applied_column(current_user_id))
+    return columns
 
 
-def get_user_applied_task_ids(user_id: int | None, task_ids: list[int]) -> set[int]:
-    if not user_id or not task_ids:
-        return set()
-    try:
-        results = db.session.query(TaskApplication.task_id).filter(
-            TaskApplication.task_id.in_(task_ids),
-            TaskApplication.applicant_id == user_id
-        ).all()
-        return {r[0] for r in results}
-    except Exception as e:
-        logger.error(f"Error fetching user applications: {e}")
-        return set()
+def _task_row_to_dict(row):
+    """Serialize a (TaskRequest, *_task_list_columns) row."""
+    fields = row._mapping
+    task_dict = row[0].to_dict()
+    task_dict['pending_applications_count'] = fields['pending_applications_count']
+    task_dict['has_applied'] = bool(fields.get('has_applied', False))
+    return task_dict
 
 
-def batch_translate_tasks(tasks_list: list[dict], lang: str | None) -> list[dict]:
-    if not lang or not tasks_list:
-        return tasks_list
-    try:
-        from app.services.translation import is_translation_enabled
-        if not is_translation_enabled():
-            return tasks_list
-    except:
-        return tasks_list
-    for task in tasks_list:
-        task = translate_task_if_needed(task, lang)
-    return tasks_list
+def _within_radius(geo_query, latitude, longitude, radius_km, dist):
+    """Restrict a geocoded task query to radius_km around the coordinates."""
+    return geo_query.filter(
+        geohash_filter(latitude, longitude, radius_km),
+        dist <= radius_km
+    )
 
 
-def _premium_sort_key(task_dict):
-    """Sort key for premium ordering: promoted first, then urgent, then regular.
+def _within_expanded_radius(geo_query, latitude, longitude, radius_km, min_results, dist):
+    """Restrict a geocoded task query to the smallest expansion step holding min_results tasks.
+    
+    The step is picked inside the same statement from the distance of the
+    min_results-th nearest task, so expanding costs one query rather than
+    a probe followed by a re-fetch.
     
-    Returns a tuple (priority_tier, secondary) where:
-    - priority_tier 0 = active promoted
-    - priority_tier 1 = active urgent
-    - priority_tier 2 = regular
+    Returns (query, search_radius) where search_radius is the SQL
+    expression for the chosen step. It evaluates to NULL (and search_radius
+    is None when no step exceeds radius_km) when no step is wide enough
+    and every geocoded task matches.
     """
-    if task_dict.get('is_promote_active'):
-        return (0,)
-    if task_dict.get('is_urgent_active'):
-        return (1,)
-    return (2,)
+    steps = [step for step in RADIUS_EXPANSION_STEPS if step > radius_km]
+    if not steps:
+        return geo_query, None
+    
+    # Only tasks inside the largest step can pick a step, so the k-th
+    # nearest is searched within its geohash cover, not across every task
+    kth_distance = _within_radius(
+        geo_query, latitude, longitude, steps[-1], dist
+    ).with_entities(dist).order_by(dist).offset(
+        min_results - 1
+    ).limit(1).statement.correlate(None).scalar_subquery()
+    # NULL when fewer than min_results tasks fit in the largest step
+    search_radius = case(
+        *[(kth_distance <= step, step) for step in steps],
+        else_=None
+    )
+    query = geo_query.filter(db.or_(search_radius.is_(None), dist <= search_radius))
+    return query, search_radius
 
 
-def _find_tasks_within_radius(base_query, latitude, longitude, radius_km):
-    """Find tasks within a given radius from coordinates.
+def _fetch_geo_page(query, dist, start, per_page, search_radius=None):
+    """Fetch one page of geo results ranked promoted → urgent → nearest.
+    
+    Ordering and LIMIT/OFFSET run in SQL, so only the requested page is
+    loaded however many tasks match (including the expand-to-ALL case).
+    The match count, farthest match and chosen expansion step ride along
+    on each row as window/constant columns, keeping it to one round-trip.
     
-    Returns list of (task_id, task_dict) tuples sorted by:
-    1. Promoted tasks first
-    2. Urgent tasks second
-    3. Then by distance
+    Returns (rows, total, max_distance, search_radius_value).
     """
-    min_lat, max_lat, min_lng, max_lng = get_bounding_box(latitude, longitude, radius_km)
-    query = base_query.filter(
-        TaskRequest.latitude.isnot(None),
-        TaskRequest.longitude.isnot(None),
-        TaskRequest.latitude >= min_lat,
-        TaskRequest.latitude <= max_lat,
-        TaskRequest.longitude >= min_lng,
-        TaskRequest.longitude <= max_lng
-    )
+    summary_columns = [
+        func.count().over().label('total_count'),
+        func.max(dist).over().label('max_distance'),
+    ]
+    if search_radius is not None:
+        summary_columns.append(search_radius.label('search_radius'))
     
-    all_tasks = query.all()
+    rows = query.add_columns(dist, *summary_columns).order_by(
+        premium_tier_expr(), dist, TaskRequest.id
+    ).offset(start).limit(per_page).all()
     
-    tasks_with_distance = []
-    for task in all_tasks:
-        dist = distance(latitude, longitude, task.latitude, task.longitude)
-        if dist <= radius_km:
-            task_dict = task.to_dict()
-            task_dict['distance'] = round(dist, 2)
-            tasks_with_distance.append((task.id, task_dict))
+    if rows:
+        fields = rows[0]._mapping
+        return rows, fields['total_count'], fields['max_distance'], fields.get('search_radius')
+    if start == 0:
+        return rows, 0, None, None
     
-    # Sort: promoted first → urgent second → then by distance
-    tasks_with_distance.sort(
-        key=lambda x: (*_premium_sort_key(x[1]), x[1]['distance'])
-    )
-    return tasks_with_distance
+    # Past the last page: no rows to read the totals from
+    aggregates = [func.count(TaskRequest.id), func.max(dist)]
+    if search_radius is not None:
+        aggregates.append(func.max(search_radius))
+    summary = query.with_entities(*aggregates).one()
+    return rows, summary[0], summary[1], summary[2] if search_radius is not None else None
 
 
 @tasks_bp.route('', methods=['GET'])
@@ -153,29 +158,37 @@ def get_tasks():
         3. Regular tasks by distance or date
     """
     try:
-        page = request.args.get('page', 1, type=int)
-        per_page = request.args.get('per_page', 20, type=int)
-        status = request.args.get('status', 'open')
-        category = request.args.get('category')
-        latitude = request.args.get('latitude', type=float)
-        longitude = request.args.get('longitude', type=float)
-        radius = request.args.get('radius', DEFAULT_RADIUS_KM, type=float)
-        min_results = request.args.get('min_results', MIN_RESULTS_DEFAULT, type=int)
-        lang = request.args.get('lang')
+        args = request.args
+        page = args.get('page', 1, type=int)
+        per_page = args.get('per_page', 20, type=int)
+        status = args.get('status', 'open')
+        category = args.get('category')
+        latitude = args.get('latitude', type=float)
+        longitude = args.get('longitude', type=float)
+        raw_radius = args.get('radius')
+        min_results = args.get('min_results', MIN_RESULTS_DEFAULT, type=int)
+        lang = args.get('lang')
         
-        if request.args.get('radius') and (latitude is None or longitude is None):
+        try:
+            radius = float(raw_radius) if raw_radius is not None else DEFAULT_RADIUS_KM
+        except ValueError:
+            radius = DEFAULT_RADIUS_KM
+        
+        if raw_radius and (latitude is None or longitude is None):
             logger.warning(
                 'GET /api/tasks: radius=%s provided without latitude/longitude — '
                 'radius will be ignored, returning all tasks',
-                request.args.get('radius')
+                raw_radius
             )
         
         current_user_id = get_current_user_id_optional()
         
+        # raiseload: any relationship to_dict() reads must be loaded up-front,
+        # so an accidental per-task lazy load fails loudly instead of going N+1
         query = TaskRequest.query.options(
-            joinedload(TaskRequest.creator),
-            joinedload(TaskRequest.assigned_user)
-        ).filter_by(status=status)
+            *task_user_load_options(),
+            raiseload('*')
+        ).add_columns(*_task_list_columns(current_user_id)).filter_by(status=status)
         
         if category:
             categories = [normalize_category(c.strip()) for c in category.split(',') if c.strip()]
@@ -185,65 +198,52 @@ def get_tasks():
                 query = query.filter(TaskRequest.category.in_(categories))
         
         if latitude is not None and longitude is not None:
+            error_response = validate_coordinates(latitude, longitude)
+            if error_response:
+                return error_response
+            
             effective_radius = radius
             radius_expanded = False
+            start = (page - 1) * per_page
             
-            tasks_with_distance = _find_tasks_within_radius(query, latitude, longitude, radius)
+            dist = distance_expr(latitude, longitude).label('distance')
+            geo_query = query.filter(
+                TaskRequest.latitude.isnot(None),
+                TaskRequest.longitude.isnot(None),
+            )
             
-            if min_results > 0 and len(tasks_with_distance) < min_results:
-                for expanded_radius in RADIUS_EXPANSION_STEPS:
-                    if expanded_radius <= radius:
-                        continue
-                    tasks_with_distance = _find_tasks_within_radius(
-                        query, latitude, longitude, expanded_radius
-                    )
-                    effective_radius = expanded_radius
-                    radius_expanded = True
-                    if len(tasks_with_distance) >= min_results:
-                        break
+            rows, total, max_distance, _ = _fetch_geo_page(
+                _within_radius(geo_query, latitude, longitude, radius, dist),
+                dist, start, per_page
+            )
+            
+            if min_results > 0 and total < min_results:
+                expanded_query, search_radius = _within_expanded_radius(
+                    geo_query, latitude, longitude, radius, min_results, dist
+                )
+                rows, total, max_distance, expanded_radius = _fetch_geo_page(
+                    expanded_query, dist, start, per_page, search_radius
+                )
+                radius_expanded = True
                 
-                if len(tasks_with_distance) < min_results:
-                    all_geo_tasks = query.filter(
-                        TaskRequest.latitude.isnot(None),
-                        TaskRequest.longitude.isnot(None),
-                    ).all()
-                    
-                    tasks_with_distance = []
-                    for task in all_geo_tasks:
-                        dist = distance(latitude, longitude, task.latitude, task.longitude)
-                        task_dict = task.to_dict()
-                        task_dict['distance'] = round(dist, 2)
-                        tasks_with_distance.append((task.id, task_dict))
-                    
-                    tasks_with_distance.sort(
-                        key=lambda x: (*_premium_sort_key(x[1]), x[1]['distance'])
-                    )
-                    
-                    if tasks_with_distance:
-                        effective_radius = tasks_with_distance[-1][1]['distance']
-                    radius_expanded = True
+                if expanded_radius is not None:
+                    effective_radius = expanded_radius
+                else:
+                    if max_distance is not None:
+                        effective_radius = max_distance
                     
                     logger.info(
                         'Smart radius: expanded to ALL tasks (%d found) '
                         'for location (%.4f, %.4f), original radius was %skm',
-                        len(tasks_with_distance), latitude, longitude, radius
+                        total, latitude, longitude, radius
                     )
             
-            total = len(tasks_with_distance)
-            start = (page - 1) * per_page
             end = start + per_page
-            paginated = tasks_with_distance[start:end]
-            
-            task_ids = [t[0] for t in paginated]
-            tasks_list = [t[1] for t in paginated]
-            
-            pending_counts = get_pending_applications_counts(task_ids)
-            user_applied_ids = get_user_applied_task_ids(current_user_id, task_ids)
-            
-            for i, task_dict in enumerate(tasks_list):
-                task_dict['pending_applications_count'] = pending_counts.get(task_ids[i], 0)
-                task_dict['has_applied'] = task_ids[i] in user_applied_ids
-            
+            tasks_list = []
+            for row in rows:
+                task_dict = _task_row_to_dict(row)
+                task_dict['distance'] = round(row.distance, 2)
+                tasks_list.append(task_dict)
             tasks_list = batch_translate_tasks(tasks_list, lang)
             
             return jsonify({
@@ -257,30 +257,12 @@ def get_tasks():
             }), 200
         else:
             # No location: sort promoted → urgent → newest
-            now = datetime.utcnow()
             tasks = query.order_by(
-                case(
-                    (db.and_(TaskRequest.is_promoted == True, TaskRequest.promoted_expires_at > now), 0),
-                    (db.and_(TaskRequest.is_urgent == True, TaskRequest.urgent_expires_at > now), 1),
-                    (db.and_(TaskRequest.is_urgent == True, TaskRequest.urgent_expires_at.is_(None)), 1),
-                    else_=2
-                ),
+                premium_tier_expr(),
                 TaskRequest.created_at.desc()
             ).paginate(page=page, per_page=per_page)
             
-            task_ids = []
-            tasks_list = []
-            for task in tasks.items:
-                task_ids.append(task.id)
-                tasks_list.append(task.to_dict())
-            
-            pending_counts = get_pending_applications_counts(task_ids)
-            user_applied_ids = get_user_applied_task_ids(current_user_id, task_ids)
-            
-            for i, task_dict in enumerate(tasks_list):
-                task_dict['pending_applications_count'] = pending_counts.get(task_ids[i], 0)
-                task_dict['has_applied'] = task_ids[i] in user_applied_ids
-            
+            tasks_list = [_task_row_to_dict(row) for row in tasks.items]
             tasks_list = batch_translate_tasks(tasks_list, lang)
             
             return jsonify({
@@ -312,9 +294,7 @@ def get_task(task_id):
             return jsonify({'error': 'Task not found'}), 404
         
         task_dict = task.to_dict()
-        
-        pending_counts = get_pending_applications_counts([task_id])
-        task_dict['pending_applications_count'] = pending_counts.get(task_id, 0)
+        task_dict['pending_applications_count'] = get_pending_applications_count(task_id)
         
         task_dict = translate_task_if_needed(task_dict, lang)
         
@@ -342,7 +322,9 @@ def create_task(current_user_id):
     try:
         data = request.get_json()
         
-        logger.info(f'Creating task for user {current_user_id} with data: {data}')
+        # Lazy %-args: the body (long descriptions, image lists) is only
+        # formatted when INFO is actually emitted
+        logger.info('Creating task for user %s with data: %s', current_user_id, data)
         
         if data.get('creator_id') and data['creator_id'] != current_user_id:
             logger.warning(
@@ -373,7 +355,7 @@ def create_task(current_user_id):
                 return jsonify({'error': 'Invalid deadline format. Use ISO format (YYYY-MM-DDTHH:MM)'}), 400
         
         difficulty = data.get('difficulty', 'medium')
-        if difficulty not in ['easy', 'medium', 'hard']:
+        if difficulty not in TASK_DIFFICULTIES:
             return jsonify({'error': 'Invalid difficulty. Must be easy, medium, or hard'}), 400
         
         task = TaskRequest(
@@ -384,7 +366,7 @@ def create_task(current_user_id):
             latitude=data['latitude'],
             longitude=data['longitude'],
             creator_id=current_user_id,
-            budget=data.get('budget'),
+            budget=budget,
             difficulty=difficulty,
             deadline=deadline,
             priority=data.get('priority', 'normal'),
@@ -434,42 +416,51 @@ def update_task(current_user_id, task_id):
         if not data:
             return jsonify({'error': 'No data provided'}), 400
         
-        logger.info(f'Updating task {task_id} for user {current_user_id} with data: {data}')
+        logger.info('Updating task %s for user %s with data: %s', task_id, current_user_id, data)
         
-        if 'budget' in data and data['budget'] is not None:
-            error_response = validate_price_range(data['budget'], 'Budget')
+        budget = data.get('budget')
+        if budget is not None:
+            error_response = validate_price_range(budget, 'Budget')
             if error_response:
                 return error_response
         
-        if 'title' in data and data['title'].strip():
-            task.title = data['title'].strip()
-        if 'description' in data and data['description'].strip():
-            task.description = data['description'].strip()
+        if 'title' in data:
+            title = data['title'].strip()
+            if title:
+                task.title = title
+        if 'description' in data:
+            description = data['description'].strip()
+            if description:
+                task.description = description
         if 'category' in data:
             category, cat_error = validate_category(data['category'])
             if cat_error:
                 return jsonify({'error': cat_error}), 400
             task.category = category
-        if 'location' in data and data['location'].strip():
-            task.location = data['location'].strip()
+        if 'location' in data:
+            location = data['location'].strip()
+            if location:
+                task.location = location
         if 'latitude' in data:
             task.latitude = data['latitude']
         if 'longitude' in data:
             task.longitude = data['longitude']
         if 'budget' in data:
-            task.budget = data['budget']
+            task.budget = budget
         if 'deadline' in data:
-            if data['deadline']:
+            deadline = data['deadline']
+            if deadline:
                 try:
-                    task.deadline = datetime.fromisoformat(data['deadline'])
+                    task.deadline = datetime.fromisoformat(deadline)
                 except ValueError:
                     return jsonify({'error': 'Invalid deadline format. Use ISO format (YYYY-MM-DDTHH:MM)'}), 400
             else:
                 task.deadline = None
         if 'difficulty' in data:
-            if data['difficulty'] not in ['easy', 'medium', 'hard']:
+            difficulty = data['difficulty']
+            if difficulty not in TASK_DIFFICULTIES:
                 return jsonify({'error': 'Invalid difficulty. Must be easy, medium, or hard'}), 400
-            task.difficulty = data['difficulty']
+            task.difficulty = difficulty
         if 'images' in data:
             task.images = data['images']
         
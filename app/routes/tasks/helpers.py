@@ -1,7 +1,40 @@
 """Shared helper functions for task routes."""
 
-from math import radians, sin, cos, sqrt, atan2
-from app.models import TaskApplication
+import logging
+from datetime import datetime
+from functools import lru_cache
+from math import pi, radians, sin, cos, sqrt, asin
+from sqlalchemy import func, select, exists, or_, and_, case
+from sqlalchemy.orm import joinedload
+from app.models import TaskRequest, TaskApplication, User
+from app.utils.geohash import covering_prefixes
+
+logger = logging.getLogger(__name__)
+
+EARTH_RADIUS_KM = 6371
+DEG_TO_RAD = pi / 180
+
+# Search centres are rounded to 3 decimals (~110 m) for the geohash cover
+# cache; the padding keeps the cover a superset despite the rounding.
+COVER_CACHE_PRECISION = 3
+COVER_CACHE_PADDING_KM = 0.1
+
+# Latitude rounding for the bounding-box delta cache (~110 m)
+BBOX_LAT_PRECISION = 3
+
+
+@lru_cache(maxsize=2048)
+def _bbox_deltas(lat_q, radius_km):
+    """Half-height and half-width in degrees of a radius_km bounding box.
+    
+    Keyed on the latitude rounded to BBOX_LAT_PRECISION decimals: the
+    deltas barely change over ~110 m, and the 111 km/degree
+    approximation already leaves more slack than the rounding costs.
+    """
+    # Approximate degrees per km at this latitude
+    lat_delta = radius_km / 111.0  # ~111 km per degree latitude
+    lng_delta = radius_km / (111.0 * cos(radians(lat_q)))  # Adjust for longitude
+    return lat_delta, lng_delta
 
 
 def get_bounding_box(lat, lng, radius_km):
@@ -9,9 +42,9 @@ def get_bounding_box(lat, lng, radius_km):
     Calculate a bounding box for SQL filtering.
     Returns (min_lat, max_lat, min_lng, max_lng).
     """
-    # Approximate degrees per km at this latitude
-    lat_delta = radius_km / 111.0  # ~111 km per degree latitude
-    lng_delta = radius_km / (111.0 * cos(radians(lat)))  # Adjust for longitude
+    # Clamped: past the poles the longitude delta would not mean anything
+    lat_q = round(min(max(lat, -90.0), 90.0), BBOX_LAT_PRECISION)
+    lat_delta, lng_delta = _bbox_deltas(lat_q, radius_km)
     
     return (
         lat - lat_delta,  # min_lat
@@ -21,15 +54,89 @@ def get_bounding_box(lat, lng, radius_km):
     )
 
 
+@lru_cache(maxsize=1024)
+def _cached_covering_prefixes(lat, lng, radius_km):
+    """Geohash cover of a search area, memoized across requests.
+    
+    Refreshes and pagination clicks from the same GPS fix reuse the cover
+    instead of recomputing the bounding box and re-encoding every cell.
+    
+    The cover is padded to a power-of-two length by repeating its last
+    prefix. The number of LIKE clauses is part of the statement's shape,
+    so padding keeps the geo queries to a handful of shapes that stay in
+    SQLAlchemy's compiled cache rather than one per cover size.
+    """
+    prefixes = covering_prefixes(*get_bounding_box(lat, lng, radius_km))
+    padded_length = 1 << (len(prefixes) - 1).bit_length()
+    return tuple(prefixes + prefixes[-1:] * (padded_length - len(prefixes)))
+
+
+def geohash_filter(lat, lng, radius_km):
+    """SQL filter matching tasks whose geohash cell overlaps the search area.
+    
+    Replaces the latitude/longitude range pre-filter: a few prefix matches
+    on the indexed geohash column instead of two independent range scans.
+    The cover is a superset of the radius, so callers still apply the
+    exact distance check.
+    """
+    prefixes = _cached_covering_prefixes(
+        round(lat, COVER_CACHE_PRECISION),
+        round(lng, COVER_CACHE_PRECISION),
+        radius_km + COVER_CACHE_PADDING_KM
+    )
+    return or_(*[TaskRequest.geohash.like(f'{prefix}%') for prefix in prefixes])
+
+
+def haversine_origin(lat, lng):
+    """Precompute the origin terms for repeated distance_from_origin() calls.
+    
+    Returns (lat_rad, lng_rad, cos_lat) so loops measuring many points
+    from one origin convert it and take its cosine only once.
+    """
+    lat_rad = lat * DEG_TO_RAD
+    return (lat_rad, lng * DEG_TO_RAD, cos(lat_rad))
+
+
+def distance_from_origin(origin, lat, lng):
+    """Haversine distance in km from a haversine_origin() to (lat, lng)."""
+    lat1, lng1, cos_lat1 = origin
+    # Convert inline rather than via map(radians, [...]), which builds a
+    # list and makes four calls per pair
+    lat2 = lat * DEG_TO_RAD
+    dlat = lat2 - lat1
+    dlng = lng * DEG_TO_RAD - lng1
+    a = sin(dlat/2)**2 + cos_lat1 * cos(lat2) * sin(dlng/2)**2
+    # asin form: one sqrt fewer than 2*atan2(sqrt(a), sqrt(1-a)); clamp
+    # guards against a drifting just past 1.0 for antipodal points
+    return 2 * EARTH_RADIUS_KM * asin(sqrt(min(a, 1.0)))
+
+
 def distance(lat1, lon1, lat2, lon2):
     """Calculate distance in km between two coordinates using Haversine formula."""
-    R = 6371  # Earth's radius in km
-    lat1, lon1, lat2, lon2 = map(radians, [lat1, lon1, lat2, lon2])
-    dlat = lat2 - lat1
-    dlon = lon2 - lon1
-    a = sin(dlat/2)**2 + cos(lat1) * cos(lat2) * sin(dlon/2)**2
-    c = 2 * atan2(sqrt(a), sqrt(1-a))
-    return R * c
+    return distance_from_origin(haversine_origin(lat1, lon1), lat2, lon2)
+
+
+def distance_expr(lat, lng):
+    """SQL expression for the Haversine distance (km) from (lat, lng) to a task.
+    
+    Uses only plain trig functions, so it runs on PostgreSQL as well as
+    SQLite (3.35+). The origin terms are computed once in Python and bound
+    as parameters instead of being re-evaluated for every row.
+    """
+    lat_rad = radians(lat)
+    lng_rad = radians(lng)
+    task_lat = func.radians(TaskRequest.latitude)
+    half_dlat = (task_lat - lat_rad) / 2
+    half_dlng = (func.radians(TaskRequest.longitude) - lng_rad) / 2
+    a = (
+        func.power(func.sin(half_dlat), 2)
+        + cos(lat_rad) * func.cos(task_lat) * func.power(func.sin(half_dlng), 2)
+    )
+    # Clamp as distance_from_origin() does: for antipodal points a can
+    # drift just past 1.0, which PostgreSQL's asin() rejects as out of range
+    # (CASE rather than LEAST(), which SQLite lacks)
+    a = case((a > 1.0, 1.0), else_=a)
+    return 2 * EARTH_RADIUS_KM * func.asin(func.sqrt(a))
 
 
 def translate_task_if_needed(task_dict: dict, lang: str | None) -> dict:
@@ -46,6 +153,24 @@ def translate_task_if_needed(task_dict: dict, lang: str | None) -> dict:
         return task_dict
 
 
+def batch_translate_tasks(tasks_list: list[dict], lang: str | None) -> list[dict]:
+    """Translate a page of tasks with a single batched service call."""
+    if not lang or not tasks_list:
+        return tasks_list
+    try:
+        from app.services.translation import is_translation_enabled, translate_tasks
+        if not is_translation_enabled():
+            return tasks_list
+    except ImportError:
+        return tasks_list
+    try:
+        return translate_tasks(tasks_list, lang)
+    except Exception as e:
+        # If translation fails, return originals
+        logger.error(f"Batch translation error: {e}")
+        return tasks_list
+
+
 def get_pending_applications_count(task_id: int) -> int:
     """Get count of pending applications for a task."""
     try:
@@ -55,3 +180,72 @@ def get_pending_applications_count(task_id: int) -> int:
         ).count()
     except Exception:
         return 0
+
+
+def get_pending_applications_counts(task_ids) -> dict:
+    """Get pending application counts for many tasks in one query.
+    
+    Returns {task_id: count}; tasks without pending applications are absent.
+    """
+    task_ids = list(task_ids)
+    if not task_ids:
+        return {}
+    rows = TaskApplication.query.with_entities(
+        TaskApplication.task_id, func.count(TaskApplication.id)
+    ).filter(
+        TaskApplication.task_id.in_(task_ids),
+        TaskApplication.status == 'pending'
+    ).group_by(TaskApplication.task_id).all()
+    return dict(rows)
+
+
+def premium_tier_expr():
+    """SQL rank of a task: 0 = active promoted, 1 = active urgent, 2 = regular.
+    
+    Mirrors TaskRequest.is_promote_active() / is_urgent_active() so lists
+    can be ordered (and paginated) by premium tier in the database.
+    """
+    now = datetime.utcnow()
+    return case(
+        (and_(TaskRequest.is_promoted == True, TaskRequest.promoted_expires_at > now), 0),
+        (and_(TaskRequest.is_urgent == True, TaskRequest.urgent_expires_at > now), 1),
+        (and_(TaskRequest.is_urgent == True, TaskRequest.urgent_expires_at.is_(None)), 1),
+        else_=2
+    )
+
+
+def pending_applications_count_column():
+    """Correlated subquery counting pending applications per task row.
+    
+    Add it to a task query with add_columns() to get the counts in the
+    same round-trip instead of a separate query per page.
+    """
+    return select(func.count(TaskApplication.id)).where(
+        TaskApplication.task_id == TaskRequest.id,
+        TaskApplication.status == 'pending'
+    ).correlate(TaskRequest).scalar_subquery().label('pending_applications_count')
+
+
+def has_applied_column(user_id: int):
+    """Correlated EXISTS telling whether user_id applied to each task row."""
+    return exists().where(
+        TaskApplication.task_id == TaskRequest.id,
+        TaskApplication.applicant_id == user_id
+    ).correlate(TaskRequest).label('has_applied')
+
+
+def task_user_load_options():
+    """Eager-load options for the users TaskRequest.to_dict() reads.
+    
+    Only the columns to_dict() touches are fetched, instead of every
+    column of the users table for each task row.
+    """
+    return [
+        joinedload(TaskRequest.creator).load_only(
+            User.id, User.username, User.first_name, User.last_name,
+            User.avatar_url, User.city
+        ),
+        joinedload(TaskRequest.assigned_user).load_only(
+            User.id, User.username, User.first_name, User.last_name
+        ),
+    ]
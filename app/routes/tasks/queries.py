@@ -1,14 +1,17 @@
 """User-specific task query routes (my tasks, created tasks, notifications)."""
 
-from datetime import datetime
 from flask import request, jsonify
-from sqlalchemy import case
-from sqlalchemy.orm import joinedload
+from sqlalchemy import func, select
 from app import db
 from app.models import TaskRequest, User, TaskApplication
 from app.utils import token_required
 from app.routes.tasks import tasks_bp
-from app.routes.tasks.helpers import translate_task_if_needed
+from app.routes.tasks.helpers import (
+    batch_translate_tasks,
+    get_pending_applications_counts,
+    task_user_load_options,
+    premium_tier_expr
+)
 
 
 def _premium_order_by():
@@ -16,16 +19,7 @@ def _premium_order_by():
     
     Order: promoted (active) → urgent (active) → regular, then newest.
     """
-    now = datetime.utcnow()
-    return [
-        case(
-            (db.and_(TaskRequest.is_promoted == True, TaskRequest.promoted_expires_at > now), 0),
-            (db.and_(TaskRequest.is_urgent == True, TaskRequest.urgent_expires_at > now), 1),
-            (db.and_(TaskRequest.is_urgent == True, TaskRequest.urgent_expires_at.is_(None)), 1),
-            else_=2
-        ),
-        TaskRequest.created_at.desc()
-    ]
+    return [premium_tier_expr(), TaskRequest.created_at.desc()]
 
 
 @tasks_bp.route('/notifications', methods=['GET'])
@@ -33,32 +27,46 @@ def _premium_order_by():
 def get_task_notifications(current_user_id):
     """Get notification counts for the current user (pending applications on their tasks)."""
     try:
-        pending_applications_count = db.session.query(TaskApplication).join(
+        # All four counts in one round-trip; each is its own scalar subquery
+        # so it can still use the index for its own predicate
+        pending_applications = select(func.count(TaskApplication.id)).join(
             TaskRequest, TaskApplication.task_id == TaskRequest.id
-        ).filter(
+        ).where(
             TaskRequest.creator_id == current_user_id,
             TaskRequest.status == 'open',
             TaskApplication.status == 'pending'
-        ).count()
+        )
         
-        pending_confirmation_count = TaskRequest.query.filter(
+        pending_confirmation = select(func.count(TaskRequest.id)).where(
             TaskRequest.creator_id == current_user_id,
             TaskRequest.status == 'pending_confirmation'
-        ).count()
+        )
         
-        accepted_applications_count = TaskApplication.query.filter(
+        accepted_applications = select(func.count(TaskApplication.id)).where(
             TaskApplication.applicant_id == current_user_id,
             TaskApplication.status == 'accepted'
-        ).count()
+        )
         
         # Count disputed tasks (for both creator and worker)
-        disputed_count = TaskRequest.query.filter(
+        disputed = select(func.count(TaskRequest.id)).where(
             db.or_(
                 TaskRequest.creator_id == current_user_id,
                 TaskRequest.assigned_to_id == current_user_id
             ),
             TaskRequest.status == 'disputed'
-        ).count()
+        )
+        
+        (
+            pending_applications_count,
+            pending_confirmation_count,
+            accepted_applications_count,
+            disputed_count
+        ) = db.session.query(
+            pending_applications.scalar_subquery(),
+            pending_confirmation.scalar_subquery(),
+            accepted_applications.scalar_subquery(),
+            disputed.scalar_subquery()
+        ).one()
         
         return jsonify({
             'pending_applications': pending_applications_count,
@@ -78,15 +86,12 @@ def get_my_tasks(current_user_id):
     try:
         lang = request.args.get('lang')
         
-        my_tasks = TaskRequest.query.options(
-            joinedload(TaskRequest.creator),
-            joinedload(TaskRequest.assigned_user)
-        ).filter(
+        my_tasks = TaskRequest.query.options(*task_user_load_options()).filter(
             TaskRequest.assigned_to_id == current_user_id,
             TaskRequest.status.in_(['assigned', 'accepted', 'in_progress', 'pending_confirmation', 'completed', 'disputed'])
         ).order_by(*_premium_order_by()).all()
         
-        tasks_list = [translate_task_if_needed(task.to_dict(), lang) for task in my_tasks]
+        tasks_list = batch_translate_tasks([task.to_dict() for task in my_tasks], lang)
         
         return jsonify({
             'tasks': tasks_list,
@@ -103,22 +108,15 @@ def get_created_tasks(current_user_id):
     try:
         lang = request.args.get('lang')
         
-        created_tasks = TaskRequest.query.options(
-            joinedload(TaskRequest.creator),
-            joinedload(TaskRequest.assigned_user)
-        ).filter(
+        created_tasks = TaskRequest.query.options(*task_user_load_options()).filter(
             TaskRequest.creator_id == current_user_id
         ).order_by(*_premium_order_by()).all()
         
-        results = []
-        for task in created_tasks:
-            task_dict = translate_task_if_needed(task.to_dict(), lang)
-            pending_count = TaskApplication.query.filter_by(
-                task_id=task.id,
-                status='pending'
-            ).count()
-            task_dict['pending_applications_count'] = pending_count
-            results.append(task_dict)
+        pending_counts = get_pending_applications_counts(task.id for task in created_tasks)
+        
+        results = batch_translate_tasks([task.to_dict() for task in created_tasks], lang)
+        for task_dict in results:
+            task_dict['pending_applications_count'] = pending_counts.get(task_dict['id'], 0)
         
         return jsonify({
             'tasks': results,
@@ -138,15 +136,12 @@ def get_user_tasks(user_id):
         if not user:
             return jsonify({'error': 'User not found'}), 404
         
-        tasks = TaskRequest.query.options(
-            joinedload(TaskRequest.creator),
-            joinedload(TaskRequest.assigned_user)
-        ).filter_by(
+        tasks = TaskRequest.query.options(*task_user_load_options()).filter_by(
             creator_id=user_id,
             status='open'
         ).order_by(*_premium_order_by()).all()
         
-        tasks_list = [translate_task_if_needed(task.to_dict(), lang) for task in tasks]
+        tasks_list = batch_translate_tasks([task.to_dict() for task in tasks], lang)
         
         return jsonify({
             'tasks': tasks_list,
@@ -169,12 +164,13 @@ def get_my_applications(current_user_id):
             applicant_id=current_user_id
         ).order_by(TaskApplication.created_at.desc()).all()
         
-        results = []
-        for app in applications:
-            app_dict = app.to_dict()
-            if app.task:
-                app_dict['task'] = translate_task_if_needed(app.task.to_dict(), lang)
-            results.append(app_dict)
+        results = [app.to_dict() for app in applications]
+        with_task = [
+            (app_dict, app.task) for app_dict, app in zip(results, applications) if app.task
+        ]
+        task_dicts = batch_translate_tasks([task.to_dict() for _, task in with_task], lang)
+        for (app_dict, _), task_dict in zip(with_task, task_dicts):
+            app_dict['task'] = task_dict
         
         return jsonify({
             'applications': results,
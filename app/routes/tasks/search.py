@@ -1,65 +1,96 @@
 """Task search functionality with multilingual support and fuzzy matching."""
 
-from flask import request, jsonify
-from sqlalchemy import or_, func
-from sqlalchemy.orm import joinedload
-from app import db
-from app.models import TaskRequest, TranslationCache
+from flask import request, jsonify, current_app
+from sqlalchemy import or_, func, select, event, inspect
+from sqlalchemy.orm import Session
+from app.models import TaskRequest, TaskApplication, TranslationCache, Review, User
 from app.routes.tasks import tasks_bp
+from app.routes.helpers import validate_coordinates
+from app.utils.search_text import normalize_text
 from app.routes.tasks.helpers import (
-    get_bounding_box,
-    distance,
-    translate_task_if_needed,
-    get_pending_applications_count
+    geohash_filter,
+    distance_expr,
+    batch_translate_tasks,
+    get_pending_applications_counts,
+    task_user_load_options,
+    premium_tier_expr
 )
 import logging
-import hashlib
+import time
+from collections import OrderedDict
+from functools import lru_cache
+from itertools import chain
 
 logger = logging.getLogger(__name__)
 
+# Search response cache (per process; production runs a single worker).
+# Entries expire after the TTL and are ignored once a transaction that
+# wrote a task, application, translation, review or displayed creator
+# field commits. Writes that bypass the ORM (raw SQL) are only picked
+# up when the TTL runs out.
+SEARCH_CACHE_TTL_SECONDS = 60
+SEARCH_CACHE_MAX_ENTRIES = 1024
+_search_cache = OrderedDict()
+_search_data_version = 0
 
-# Latvian diacritics mapping for normalization
-LATVIAN_DIACRITICS = {
-    '\u0101': 'a', '\u010d': 'c', '\u0113': 'e', '\u0123': 'g', '\u012b': 'i', 
-    '\u0137': 'k', '\u013c': 'l', '\u0146': 'n', '\u0161': 's', '\u016b': 'u', 
-    '\u017e': 'z', '\u014d': 'o',
-    # Uppercase versions
-    '\u0100': 'a', '\u010c': 'c', '\u0112': 'e', '\u0122': 'g', '\u012a': 'i',
-    '\u0136': 'k', '\u013b': 'l', '\u0145': 'n', '\u0160': 's', '\u016a': 'u',
-    '\u017d': 'z', '\u014c': 'o',
-}
+# Models whose writes can change a search response
+_SEARCH_MODELS = (TaskRequest, TaskApplication, TranslationCache, Review)
+# User columns embedded in results (frequent last_seen writes don't count)
+_SEARCH_USER_COLUMNS = ('username', 'first_name', 'last_name', 'avatar_url', 'city')
+# Session.info flag: this transaction wrote something search results show
+_SEARCH_WRITE_FLAG = 'search_cache_write'
 
-# Russian common character simplifications (for typos)
-RUSSIAN_SIMPLIFICATIONS = {
-    '\u0451': '\u0435',  # ё -> е
-    '\u0401': '\u0415',  # Ё -> Е
-}
 
+def _changes_search_results(obj, deleted=False):
+    """Whether flushing obj can change a cached search response."""
+    if isinstance(obj, _SEARCH_MODELS):
+        return True
+    if isinstance(obj, User):
+        state = inspect(obj)
+        return deleted or any(
+            state.attrs[column].history.has_changes() for column in _SEARCH_USER_COLUMNS
+        )
+    return False
 
-def normalize_text(text: str) -> str:
-    """Normalize text by removing diacritics and simplifying characters.
-    
-    Handles:
-    - Latvian: tīrīt → tirit, ābolā → abola
-    - Russian: ёлка → елка
-    - Case: SNOW → snow
-    """
-    if not text:
-        return ''
-    
-    result = text.lower()
-    
-    # Apply Latvian diacritics normalization
-    for latvian_char, ascii_char in LATVIAN_DIACRITICS.items():
-        result = result.replace(latvian_char, ascii_char)
-    
-    # Apply Russian simplifications
-    for ru_char, simple_char in RUSSIAN_SIMPLIFICATIONS.items():
-        result = result.replace(ru_char, simple_char)
-    
-    return result
+
+@event.listens_for(Session, 'after_flush')
+def _flag_search_flush(session, flush_context):
+    """Remember that the transaction flushed a search-visible change."""
+    if session.info.get(_SEARCH_WRITE_FLAG):
+        return
+    if any(_changes_search_results(obj) for obj in chain(session.new, session.dirty)) or \
+            any(_changes_search_results(obj, deleted=True) for obj in session.deleted):
+        session.info[_SEARCH_WRITE_FLAG] = True
+
+
+@event.listens_for(Session, 'do_orm_execute')
+def _flag_search_bulk_write(orm_execute_state):
+    """Remember bulk query.update()/delete() and insert() on search models."""
+    if orm_execute_state.is_select:
+        return
+    mapper = orm_execute_state.bind_mapper
+    if mapper is not None and issubclass(mapper.class_, _SEARCH_MODELS + (User,)):
+        orm_execute_state.session.info[_SEARCH_WRITE_FLAG] = True
+
+
+@event.listens_for(Session, 'after_commit')
+def _bump_search_data_version(session):
+    """Invalidate cached search responses once a flagged write commits."""
+    global _search_data_version
+    if session.in_nested_transaction():
+        return  # Savepoint release; the outer transaction may still roll back
+    if session.info.pop(_SEARCH_WRITE_FLAG, False):
+        _search_data_version += 1
+
+
+@event.listens_for(Session, 'after_soft_rollback')
+def _clear_search_write_flag(session, previous_transaction):
+    """Writes rolled back with the outermost transaction never became visible."""
+    if previous_transaction.parent is None:
+        session.info.pop(_SEARCH_WRITE_FLAG, None)
 
 
+@lru_cache(maxsize=8192)
 def get_word_stem(word: str, min_stem_length: int = 4) -> str:
     """Get the stem of a word for fuzzy matching.
     
@@ -81,120 +112,111 @@ def get_word_stem(word: str, min_stem_length: int = 4) -> str:
     return word[:stem_length]
 
 
-def create_search_patterns(search_query: str) -> list:
+@lru_cache(maxsize=4096)
+def create_search_patterns(search_query: str) -> tuple:
     """Create multiple search patterns for fuzzy matching.
     
     For each word, creates patterns for:
-    1. Original word (exact match)
-    2. Normalized word (without diacritics)  
-    3. Word stem (for grammatical variations)
+    1. Normalized word (lowercase, without diacritics)
+    2. Word stem (for grammatical variations)
     
-    Returns list of unique patterns to search for.
-    """
-    patterns = set()
+    Task and translation texts are matched in their normalized form, so
+    the raw word and its stem would only repeat these or never match.
     
-    # Split into words, minimum 2 characters
-    words = [w.strip().lower() for w in search_query.split() if len(w.strip()) >= 2]
+    Returns a tuple of unique patterns to search for. Memoized on the
+    query string: popular searches repeat from request to request.
+    """
+    # Split into words, minimum 2 characters (split() already strips)
+    words = {w.lower() for w in search_query.split() if len(w) >= 2}
     
     if not words:
-        words = [search_query.lower()]
+        words = {search_query.lower()}
     
+    patterns = set()
     for word in words:
-        # 1. Original word (lowercased)
-        patterns.add(word)
-        
-        # 2. Normalized (no diacritics)
         normalized = normalize_text(word)
         patterns.add(normalized)
-        
-        # 3. Word stem for both original and normalized
         if len(word) >= 4:
-            patterns.add(get_word_stem(word))
             patterns.add(get_word_stem(normalized))
     
-    return list(patterns)
-
+    return tuple(patterns)
 
-def get_text_hash(text: str) -> str:
-    """Generate a hash for the text (same as translation service)."""
-    return hashlib.sha256(text.encode('utf-8')).hexdigest()
 
-
-def get_task_searchable_text(task, search_patterns: list) -> dict:
-    """Get all searchable text for a task including translations.
+def task_search_filter(search_patterns: tuple):
+    """SQL filter for tasks matching any of the search patterns.
     
-    Returns dict with:
-    - original: normalized original title + description
-    - translations: list of normalized translated texts
+    Matches in:
+    1. Original title and description (normalized, TaskRequest.search_text)
+    2. All cached translations (normalized, TranslationCache.search_text)
     """
-    result = {
-        'original': '',
-        'translations': []
-    }
-    
-    # Original text (normalized)
-    title = task.title or ''
-    description = task.description or ''
-    result['original'] = normalize_text(f'{title} {description}')
+    conditions = [
+        TaskRequest.search_text.contains(pattern, autoescape=True)
+        for pattern in search_patterns
+    ]
     
-    # Get cached translations for title and description
-    try:
-        title_hash = get_text_hash(title) if title else None
-        desc_hash = get_text_hash(description) if description else None
-        
-        # Find all translations for this task's title and description
-        hashes_to_find = [h for h in [title_hash, desc_hash] if h]
-        
-        if hashes_to_find:
-            cached_translations = TranslationCache.query.filter(
-                TranslationCache.text_hash.in_(hashes_to_find)
-            ).all()
-            
-            for cache in cached_translations:
-                normalized_translation = normalize_text(cache.translated_text)
-                result['translations'].append(normalized_translation)
-    except Exception as e:
-        logger.warning(f'Error fetching translations for task {task.id}: {e}')
+    # A task matches through its translation when its title or description
+    # is the original_text of a matching cache row (user searches 'snow'
+    # and finds Latvian 'tīrīt sniegu'); resolved in the same statement
+    translated_originals = select(TranslationCache.original_text).where(or_(*[
+        TranslationCache.search_text.contains(pattern, autoescape=True)
+        for pattern in search_patterns
+    ]))
+    conditions.append(TaskRequest.title.in_(translated_originals))
+    conditions.append(TaskRequest.description.in_(translated_originals))
     
-    return result
+    return or_(*conditions)
 
 
-def task_matches_search(task, search_patterns: list) -> bool:
-    """Check if a task matches any of the search patterns.
-    
-    Searches in:
-    1. Original title and description (normalized)
-    2. All cached translations (normalized)
-    """
-    searchable = get_task_searchable_text(task, search_patterns)
+def _fetch_search_page(query, order_by, start, per_page):
+    """Fetch one page of search matches, ordered and paginated in SQL.
     
-    # Check original text
-    for pattern in search_patterns:
-        if pattern in searchable['original']:
-            return True
+    The match count rides along on each row as a window column, so only
+    a page past the last one needs a second query for the total.
     
-    # Check translations
-    for translation in searchable['translations']:
-        for pattern in search_patterns:
-            if pattern in translation:
-                return True
+    Returns (rows, total); each row is (TaskRequest, *added columns).
+    """
+    rows = query.add_columns(func.count().over().label('total_count')).order_by(
+        *order_by
+    ).offset(start).limit(per_page).all()
     
-    return False
+    if rows:
+        return rows, rows[0].total_count
+    if start <= 0:
+        return rows, 0
+    return rows, query.order_by(None).count()
+
+
+def _cached_search_response(key):
+    """Cached search payload for key, or None if missing, expired or stale."""
+    entry = _search_cache.get(key)
+    if entry is None:
+        return None
+    expires_at, version, payload = entry
+    if version != _search_data_version or expires_at < time.monotonic():
+        _search_cache.pop(key, None)
+        return None
+    # Least recently used entries are evicted first; hot queries stay
+    _search_cache.move_to_end(key)
+    return payload
 
 
-def _premium_sort_key(task_dict):
-    """Sort key for premium ordering: promoted first, then urgent, then regular.
+def _cache_search_response(key, payload, ttl, version):
+    """Store a search payload, evicting least recently used entries beyond the limit.
     
-    Returns an int where:
-    - 0 = active promoted
-    - 1 = active urgent
-    - 2 = regular
+    version is the data version read before the payload was queried, so a
+    write committed meanwhile leaves the entry already stale.
     """
-    if task_dict.get('is_promote_active'):
-        return 0
-    if task_dict.get('is_urgent_active'):
-        return 1
-    return 2
+    _search_cache[key] = (time.monotonic() + ttl, version, payload)
+    _search_cache.move_to_end(key)
+    while len(_search_cache) > SEARCH_CACHE_MAX_ENTRIES:
+        _search_cache.popitem(last=False)
+
+
+def _attach_pending_counts(task_dicts):
+    """Fill pending_applications_count for a page of task dicts (one query)."""
+    pending_counts = get_pending_applications_counts(t['id'] for t in task_dicts)
+    for task_dict in task_dicts:
+        task_dict['pending_applications_count'] = pending_counts.get(task_dict['id'], 0)
 
 
 @tasks_bp.route('/search', methods=['GET'])
@@ -234,94 +256,78 @@ def search_tasks():
         radius = request.args.get('radius', 10, type=float)
         lang = request.args.get('lang')
         
+        if latitude is not None and longitude is not None:
+            error_response = validate_coordinates(latitude, longitude)
+            if error_response:
+                return error_response
+        
         logger.info(f'Searching tasks with query: "{search_query}", lang: {lang}, status: {status}')
         
+        # Popular searches repeat across users; serve them from the cache
+        cache_ttl = current_app.config.get('SEARCH_CACHE_TTL_SECONDS', SEARCH_CACHE_TTL_SECONDS)
+        cache_key = (search_query, page, per_page, status, category, latitude, longitude, radius, lang)
+        cache_version = _search_data_version
+        if cache_ttl:
+            cached = _cached_search_response(cache_key)
+            if cached is not None:
+                return jsonify(cached), 200
+        
         # Create fuzzy search patterns
         search_patterns = create_search_patterns(search_query)
         logger.info(f'Search patterns: {search_patterns}')
         
         # Build base query
         query = TaskRequest.query.options(
-            joinedload(TaskRequest.creator),
-            joinedload(TaskRequest.assigned_user)
+            *task_user_load_options()
         ).filter_by(status=status)
         
         if category:
             query = query.filter_by(category=category)
         
-        # Get all tasks matching status/category first
-        all_candidate_tasks = query.order_by(TaskRequest.created_at.desc()).all()
-        logger.info(f'Found {len(all_candidate_tasks)} candidate tasks')
-        
-        # Fuzzy + multilingual match
-        matching_tasks = []
-        for task in all_candidate_tasks:
-            if task_matches_search(task, search_patterns):
-                matching_tasks.append(task)
-        
-        logger.info(f'Found {len(matching_tasks)} matching tasks after multilingual fuzzy search')
+        # Fuzzy + multilingual match, in the database
+        query = query.filter(task_search_filter(search_patterns))
+        start = (page - 1) * per_page
+        end = start + per_page
         
         # Apply location filtering if requested
         if latitude is not None and longitude is not None:
-            min_lat, max_lat, min_lng, max_lng = get_bounding_box(latitude, longitude, radius)
-            
-            tasks_with_distance = []
-            for task in matching_tasks:
-                if task.latitude is None or task.longitude is None:
-                    continue
-                if not (min_lat <= task.latitude <= max_lat and min_lng <= task.longitude <= max_lng):
-                    continue
-                    
-                dist = distance(latitude, longitude, task.latitude, task.longitude)
-                if dist <= radius:
-                    task_dict = task.to_dict()
-                    task_dict['distance'] = round(dist, 2)
-                    task_dict['pending_applications_count'] = get_pending_applications_count(task.id)
-                    task_dict = translate_task_if_needed(task_dict, lang)
-                    tasks_with_distance.append(task_dict)
-            
+            dist = distance_expr(latitude, longitude).label('distance')
+            query = query.filter(
+                TaskRequest.latitude.isnot(None),
+                TaskRequest.longitude.isnot(None),
+                geohash_filter(latitude, longitude, radius),
+                dist <= radius
+            ).add_columns(dist)
             # Sort: promoted first → urgent second → then by distance
-            tasks_with_distance.sort(key=lambda x: (_premium_sort_key(x), x['distance']))
-            
-            total = len(tasks_with_distance)
-            start = (page - 1) * per_page
-            end = start + per_page
-            paginated_results = tasks_with_distance[start:end]
-            
-            logger.info(f'Returning {len(paginated_results)} tasks (total: {total})')
-            
-            return jsonify({
-                'tasks': paginated_results,
-                'total': total,
-                'page': page,
-                'per_page': per_page,
-                'has_more': end < total
-            }), 200
+            order_by = [premium_tier_expr(), dist, TaskRequest.created_at.desc()]
         else:
-            # No location filter
-            tasks_list = []
-            for task in matching_tasks:
-                task_dict = translate_task_if_needed(task.to_dict(), lang)
-                task_dict['pending_applications_count'] = get_pending_applications_count(task.id)
-                tasks_list.append(task_dict)
-            
-            # Sort: promoted first → urgent second → then by date (already desc)
-            tasks_list.sort(key=lambda x: _premium_sort_key(x))
-            
-            total = len(tasks_list)
-            start = (page - 1) * per_page
-            end = start + per_page
-            paginated_results = tasks_list[start:end]
-            
-            logger.info(f'Returning {len(paginated_results)} tasks (total: {total})')
-            
-            return jsonify({
-                'tasks': paginated_results,
-                'total': total,
-                'page': page,
-                'per_page': per_page,
-                'has_more': end < total
-            }), 200
+            dist = None
+            # Sort: promoted first → urgent second → then by date
+            order_by = [premium_tier_expr(), TaskRequest.created_at.desc()]
+        
+        rows, total = _fetch_search_page(query, order_by, start, per_page)
+        
+        paginated_results = []
+        for row in rows:
+            task_dict = row[0].to_dict()
+            if dist is not None:
+                task_dict['distance'] = round(row.distance, 2)
+            paginated_results.append(task_dict)
+        paginated_results = batch_translate_tasks(paginated_results, lang)
+        _attach_pending_counts(paginated_results)
+        
+        logger.info(f'Returning {len(paginated_results)} tasks (total: {total})')
+        
+        payload = {
+            'tasks': paginated_results,
+            'total': total,
+            'page': page,
+            'per_page': per_page,
+            'has_more': end < total
+        }
+        if cache_ttl:
+            _cache_search_response(cache_key, payload, cache_ttl, cache_version)
+        return jsonify(payload), 200
             
     except Exception as e:
         logger.error(f'Error searching tasks: {str(e)}', exc_info=True)
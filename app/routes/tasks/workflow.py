@@ -1,8 +1,9 @@
 """Task workflow/lifecycle routes (mark-done, confirm, dispute, cancel)."""
 
 from flask import request, jsonify
+from sqlalchemy.orm import joinedload
 from app import db
-from app.models import TaskRequest, User
+from app.models import TaskRequest
 from app.services.push_notifications import (
     notify_task_marked_done,
     notify_task_confirmed,
@@ -10,9 +11,45 @@ from app.services.push_notifications import (
     notify_task_cancelled as push_notify_cancelled,
     notify_review_reminder as push_notify_review_reminder
 )
-from app.utils import token_required, get_display_name, send_push_safe
+from app.utils import token_required, get_display_name, send_push_background
 from app.routes.tasks import tasks_bp
 from datetime import datetime
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+def _get_task_with_parties(task_id):
+    """Load and lock a task together with its creator and assigned worker.
+    
+    The notifications need both users' display names; loading them in
+    the same query saves a User lookup per party.
+    
+    The task row is locked (SELECT ... FOR UPDATE OF task_requests) until
+    the route commits, so two concurrent transitions can't both pass the
+    status check. Not query.get(): it could return the task from the
+    identity map without taking the lock.
+    """
+    return TaskRequest.query.options(
+        joinedload(TaskRequest.creator),
+        joinedload(TaskRequest.assigned_user)
+    ).with_for_update(of=TaskRequest).filter_by(id=task_id).first()
+
+
+def _commit_keeping_loaded():
+    """Commit without expiring the objects loaded in this session.
+    
+    Each route serializes the task right after committing, and every
+    value it reads was either just loaded or just written by the route;
+    expiring would only make to_dict() reload the row and its users.
+    """
+    session = db.session()
+    expire_on_commit = session.expire_on_commit
+    session.expire_on_commit = False
+    try:
+        session.commit()
+    finally:
+        session.expire_on_commit = expire_on_commit
 
 
 @tasks_bp.route('/<int:task_id>/mark-done', methods=['POST'])
@@ -20,7 +57,7 @@ from datetime import datetime
 def mark_task_done(current_user_id, task_id):
     """Worker marks task as done - awaiting creator confirmation."""
     try:
-        task = TaskRequest.query.get(task_id)
+        task = _get_task_with_parties(task_id)
         if not task:
             return jsonify({'error': 'Task not found'}), 404
         
@@ -30,17 +67,28 @@ def mark_task_done(current_user_id, task_id):
         if task.status not in ['assigned', 'in_progress']:
             return jsonify({'error': 'Task cannot be marked as done in current status'}), 400
         
+        worker_name = get_display_name(task.assigned_user)
+        
+        creator_id = task.creator_id
+        task_title = task.title
+        
         task.status = 'pending_confirmation'
         task.updated_at = datetime.utcnow()
-        db.session.commit()
+        
+        # The in-app notification commits with the status change; the
+        # savepoint keeps a failed notification from undoing it
+        try:
+            from app.routes.notifications import notify_task_marked_done as inapp_notify_done
+            with db.session.begin_nested():
+                inapp_notify_done(creator_id, worker_name, task_title, task_id)
+        except Exception as notify_error:
+            logger.warning('In-app notification skipped (non-critical): %s', notify_error)
+        
+        _commit_keeping_loaded()
         
         task_dict = task.to_dict()
-        creator_id = task.creator_id
-        task_title = task.title
         
-        worker = User.query.get(current_user_id)
-        worker_name = get_display_name(worker)
-        send_push_safe(
+        send_push_background(
             notify_task_marked_done,
             task_owner_id=creator_id,
             worker_name=worker_name,
@@ -48,14 +96,6 @@ def mark_task_done(current_user_id, task_id):
             task_id=task_id
         )
         
-        try:
-            from app.routes.notifications import notify_task_marked_done as inapp_notify_done
-            inapp_notify_done(creator_id, worker_name, task_title, task_id)
-            db.session.commit()
-        except Exception as notify_error:
-            db.session.rollback()
-            print(f"In-app notification skipped (non-critical): {notify_error}")
-        
         return jsonify({
             'message': 'Task marked as done. Waiting for creator confirmation.',
             'task': task_dict
@@ -70,7 +110,7 @@ def mark_task_done(current_user_id, task_id):
 def confirm_task_completion(current_user_id, task_id):
     """Creator confirms task completion."""
     try:
-        task = TaskRequest.query.get(task_id)
+        task = _get_task_with_parties(task_id)
         if not task:
             return jsonify({'error': 'Task not found'}), 404
         
@@ -80,56 +120,50 @@ def confirm_task_completion(current_user_id, task_id):
         if task.status != 'pending_confirmation':
             return jsonify({'error': 'Task is not pending confirmation'}), 400
         
-        task.status = 'completed'
-        task.completed_at = datetime.utcnow()
-        task.updated_at = datetime.utcnow()
-        db.session.commit()
+        creator_name = get_display_name(task.creator)
+        worker_name = get_display_name(task.assigned_user)
         
-        task_dict = task.to_dict()
         worker_id = task.assigned_to_id
         task_title = task.title
         
-        # Push notification to worker: task confirmed
-        send_push_safe(
-            notify_task_confirmed,
-            worker_id=worker_id,
-            task_title=task_title,
-            task_id=task_id
-        )
+        task.status = 'completed'
+        task.completed_at = datetime.utcnow()
+        task.updated_at = datetime.utcnow()
         
-        # In-app notifications
+        # In-app notifications, committed with the status change (savepoint
+        # so a failure here doesn't undo the completion)
         try:
             from app.routes.notifications import (
                 notify_task_completed as inapp_notify_completed,
                 notify_review_reminder
             )
             
-            # 1. Tell the worker the task is confirmed complete
-            inapp_notify_completed(worker_id, task_title, task_id)
-            
-            # 2. Send review reminder to the worker (to review the creator)
-            creator = User.query.get(current_user_id)
-            creator_name = get_display_name(creator)
-            notify_review_reminder(worker_id, creator_name, task_title, task_id)
-            
-            # 3. Send review reminder to the creator (to review the worker)
-            worker = User.query.get(worker_id)
-            worker_name = get_display_name(worker)
-            notify_review_reminder(current_user_id, worker_name, task_title, task_id)
-            
-            db.session.commit()
+            with db.session.begin_nested():
+                # 1. Tell the worker the task is confirmed complete
+                inapp_notify_completed(worker_id, task_title, task_id)
+                
+                # 2. Send review reminder to the worker (to review the creator)
+                notify_review_reminder(worker_id, creator_name, task_title, task_id)
+                
+                # 3. Send review reminder to the creator (to review the worker)
+                notify_review_reminder(current_user_id, worker_name, task_title, task_id)
         except Exception as notify_error:
-            db.session.rollback()
-            print(f"In-app notification skipped (non-critical): {notify_error}")
+            logger.warning('In-app notification skipped (non-critical): %s', notify_error)
         
-        # Push notifications for review reminders
-        creator = User.query.get(current_user_id)
-        creator_name = get_display_name(creator)
-        worker = User.query.get(worker_id)
-        worker_name = get_display_name(worker)
+        _commit_keeping_loaded()
+        
+        task_dict = task.to_dict()
+        
+        # Push notification to worker: task confirmed
+        send_push_background(
+            notify_task_confirmed,
+            worker_id=worker_id,
+            task_title=task_title,
+            task_id=task_id
+        )
         
         # Review reminder push to worker (to review the creator)
-        send_push_safe(
+        send_push_background(
             push_notify_review_reminder,
             user_id=worker_id,
             other_party_name=creator_name,
@@ -138,7 +172,7 @@ def confirm_task_completion(current_user_id, task_id):
         )
         
         # Review reminder push to creator (to review the worker)
-        send_push_safe(
+        send_push_background(
             push_notify_review_reminder,
             user_id=current_user_id,
             other_party_name=worker_name,
@@ -160,7 +194,7 @@ def confirm_task_completion(current_user_id, task_id):
 def dispute_task(current_user_id, task_id):
     """Creator disputes that task was completed properly."""
     try:
-        task = TaskRequest.query.get(task_id)
+        task = _get_task_with_parties(task_id)
         if not task:
             return jsonify({'error': 'Task not found'}), 404
         
@@ -173,32 +207,32 @@ def dispute_task(current_user_id, task_id):
         data = request.get_json() or {}
         reason = data.get('reason', '')
         
+        task_title = task.title
+        worker_id = task.assigned_to_id
+        
         task.status = 'disputed'
         task.updated_at = datetime.utcnow()
-        db.session.commit()
         
-        task_title = task.title
-        worker_id = task.assigned_to_id
+        # In-app notification to the worker, committed with the status change
+        if worker_id:
+            try:
+                from app.routes.notifications import notify_task_disputed as inapp_notify_disputed
+                with db.session.begin_nested():
+                    inapp_notify_disputed(worker_id, task_title, task_id, is_creator=False)
+            except Exception as notify_error:
+                logger.warning('In-app dispute notification skipped (non-critical): %s', notify_error)
+        
+        _commit_keeping_loaded()
         
         # Push notification to the worker
         if worker_id:
-            send_push_safe(
+            send_push_background(
                 push_notify_disputed,
                 user_id=worker_id,
                 task_title=task_title,
                 task_id=task_id
             )
         
-        # In-app notification to the worker
-        if worker_id:
-            try:
-                from app.routes.notifications import notify_task_disputed as inapp_notify_disputed
-                inapp_notify_disputed(worker_id, task_title, task_id, is_creator=False)
-                db.session.commit()
-            except Exception as notify_error:
-                db.session.rollback()
-                print(f"In-app dispute notification skipped (non-critical): {notify_error}")
-        
         return jsonify({
             'message': 'Task has been disputed. Please resolve with the worker.',
             'task': task.to_dict()
@@ -213,7 +247,7 @@ def dispute_task(current_user_id, task_id):
 def cancel_task(current_user_id, task_id):
     """Cancel a task (only creator can cancel, only if not yet completed)."""
     try:
-        task = TaskRequest.query.get(task_id)
+        task = _get_task_with_parties(task_id)
         if not task:
             return jsonify({'error': 'Task not found'}), 404
         
@@ -228,35 +262,36 @@ def cancel_task(current_user_id, task_id):
         
         task.status = 'cancelled'
         task.updated_at = datetime.utcnow()
-        db.session.commit()
         
-        # Notify the assigned worker (if any) that the task was cancelled
+        # In-app notification to the assigned worker (if any), committed
+        # with the status change
+        if worker_id:
+            try:
+                from app.routes.notifications import create_notification
+                from app.models import NotificationType
+                with db.session.begin_nested():
+                    create_notification(
+                        user_id=worker_id,
+                        notification_type=NotificationType.TASK_CANCELLED,
+                        title='\u274c Task Cancelled',
+                        message=f'The task "{task_title}" has been cancelled by the creator.',
+                        related_type='task',
+                        related_id=task_id,
+                        data={'task_title': task_title}
+                    )
+            except Exception as notify_error:
+                logger.warning('In-app cancel notification skipped (non-critical): %s', notify_error)
+        
+        _commit_keeping_loaded()
+        
+        # Push notification to the assigned worker (if any)
         if worker_id:
-            # Push notification
-            send_push_safe(
+            send_push_background(
                 push_notify_cancelled,
                 user_id=worker_id,
                 task_title=task_title,
                 task_id=task_id
             )
-            
-            # In-app notification
-            try:
-                from app.routes.notifications import create_notification
-                from app.models import NotificationType
-                create_notification(
-                    user_id=worker_id,
-                    notification_type=NotificationType.TASK_CANCELLED,
-                    title='\u274c Task Cancelled',
-                    message=f'The task "{task_title}" has been cancelled by the creator.',
-                    related_type='task',
-                    related_id=task_id,
-                    data={'task_title': task_title}
-                )
-                db.session.commit()
-            except Exception as notify_error:
-                db.session.rollback()
-                print(f"In-app cancel notification skipped (non-critical): {notify_error}")
         
         return jsonify({
             'message': 'Task has been cancelled.',
@@ -8,6 +8,7 @@ Supports uploading images for:
 
 from flask import Blueprint, request, jsonify
 import logging
+import os
 
 from app.services.storage import (
     upload_avatar,
@@ -30,20 +31,39 @@ AVATAR_MAX_SIZE = 5 * 1024 * 1024  # 5MB
 TASK_IMAGE_MAX_SIZE = 10 * 1024 * 1024  # 10MB
 CHAT_IMAGE_MAX_SIZE = 10 * 1024 * 1024  # 10MB
 
+# Room for multipart boundaries and part headers on top of the file itself
+MULTIPART_OVERHEAD = 64 * 1024  # 64KB
+
 
 def allowed_image(filename):
     """Check if file is an allowed image type."""
-    return '.' in filename and \
-           filename.rsplit('.', 1)[1].lower() in IMAGE_EXTENSIONS
+    _, dot, ext = filename.rpartition('.')
+    return bool(dot) and ext.lower() in IMAGE_EXTENSIONS
+
+
+def file_too_large_error(max_size: int):
+    """Error response for a file over max_size bytes."""
+    max_mb = max_size // (1024 * 1024)
+    return jsonify({
+        'error': f'File too large. Maximum size: {max_mb}MB'
+    }), 400
 
 
 def get_file_from_request(max_size: int):
     """Extract and validate file from request.
     
+    Oversized uploads are rejected from the Content-Length header before
+    the form is parsed, and from the spooled file's size before it is
+    read, so only accepted files are loaded into memory.
+    
     Returns:
         Tuple of (file_data, filename, content_type, error_response)
         If error: (None, None, None, error_response)
     """
+    content_length = request.content_length
+    if content_length is not None and content_length > max_size + MULTIPART_OVERHEAD:
+        return None, None, None, file_too_large_error(max_size)
+    
     if 'file' not in request.files:
         return None, None, None, (jsonify({'error': 'No file provided'}), 400)
     
@@ -58,15 +78,15 @@ def get_file_from_request(max_size: int):
             'error': f'File type not allowed. Allowed: {allowed_types}'
         }), 400)
     
-    # Read file data
-    file_data = file.read()
+    # Check file size on the spooled upload, without reading it
+    file.stream.seek(0, os.SEEK_END)
+    file_size = file.stream.tell()
+    file.stream.seek(0)
+    if file_size > max_size:
+        return None, None, None, file_too_large_error(max_size)
     
-    # Check file size
-    if len(file_data) > max_size:
-        max_mb = max_size // (1024 * 1024)
-        return None, None, None, (jsonify({
-            'error': f'File too large. Maximum size: {max_mb}MB'
-        }), 400)
+    # Read file data (the storage client uploads bytes)
+    file_data = file.read()
     
     return file_data, file.filename, file.content_type, None
 
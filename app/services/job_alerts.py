@@ -7,13 +7,17 @@ Called after a new task is created. Finds users who:
 4. Match category preferences (or have no category filter = all)
 5. Are NOT the task creator
 
-Creates a new_task_nearby notification for each matching user.
+Creates a new_task_nearby notification for each matching user; the
+notifications are saved together in one bulk insert.
 """
 
 import logging
+from sqlalchemy import insert
+from sqlalchemy.orm import load_only
 from app import db
-from app.models import User
-from app.routes.tasks.helpers import distance
+from app.models.notification import Notification
+from app.models.user import User, MAX_JOB_ALERT_RADIUS_KM
+from app.routes.tasks.helpers import get_bounding_box, haversine_origin, distance_from_origin
 from app.utils import send_push_safe
 
 logger = logging.getLogger(__name__)
@@ -32,7 +36,7 @@ def send_job_alerts_for_task(task) -> int:
     Returns:
         Number of notifications created
     """
-    from app.routes.notifications import notify_new_task_nearby
+    from app.routes.notifications import new_task_nearby_values
     from app.services.push_notifications import notify_new_job_nearby
     
     # Task must have coordinates
@@ -40,20 +44,29 @@ def send_job_alerts_for_task(task) -> int:
         logger.debug(f'Task {task.id} has no coordinates, skipping job alerts')
         return 0
     
-    # Find all users with job alerts enabled + location set.
-    # We filter in Python because job_alert_preferences is a JSON text field.
-    candidates = User.query.filter(
-        User.latitude.isnot(None),
-        User.longitude.isnot(None),
+    # Find users with alert preferences whose location is within the largest
+    # alert radius of the task. The bounding box drops far-away users in SQL;
+    # enabled/category/own-radius are checked in Python because
+    # job_alert_preferences is a JSON text field.
+    # Only the columns the loop reads are loaded, not whole user rows.
+    min_lat, max_lat, min_lng, max_lng = get_bounding_box(
+        task.latitude, task.longitude, MAX_JOB_ALERT_RADIUS_KM
+    )
+    candidates = User.query.options(
+        load_only(User.id, User.latitude, User.longitude, User.job_alert_preferences)
+    ).filter(
+        User.latitude.between(min_lat, max_lat),
+        User.longitude.between(min_lng, max_lng),
         User.job_alert_preferences.isnot(None),
         User.id != task.creator_id,  # Don't notify the creator
         User.is_active == True,
     ).all()
     
-    notified = 0
+    notifications = []
+    task_origin = haversine_origin(task.latitude, task.longitude)
     
     for user in candidates:
-        if notified >= MAX_NOTIFY_PER_TASK:
+        if len(notifications) >= MAX_NOTIFY_PER_TASK:
             logger.info(f'Hit MAX_NOTIFY_PER_TASK ({MAX_NOTIFY_PER_TASK}) for task {task.id}')
             break
         
@@ -69,8 +82,8 @@ def send_job_alerts_for_task(task) -> int:
             continue
         
         # Distance check
-        radius_km = prefs.get('radius_km', 5)
-        dist = distance(user.latitude, user.longitude, task.latitude, task.longitude)
+        radius_km = min(prefs.get('radius_km', 5), MAX_JOB_ALERT_RADIUS_KM)
+        dist = distance_from_origin(task_origin, user.latitude, user.longitude)
         
         if dist > radius_km:
             continue
@@ -80,9 +93,9 @@ def send_job_alerts_for_task(task) -> int:
         if task.budget:
             budget_display = f'\u20ac{task.budget}'
         
-        # Create in-app notification
+        # Create in-app notification (saved in bulk below)
         try:
-            notify_new_task_nearby(
+            notifications.append(new_task_nearby_values(
                 user_id=user.id,
                 task_title=task.title,
                 task_id=task.id,
@@ -90,8 +103,7 @@ def send_job_alerts_for_task(task) -> int:
                 distance_km=round(dist, 1),
                 budget=budget_display,
                 location=task.location,
-            )
-            notified += 1
+            ))
         except Exception as e:
             logger.error(f'Error creating job alert for user {user.id}: {e}')
             continue
@@ -105,8 +117,12 @@ def send_job_alerts_for_task(task) -> int:
             distance_km=round(dist, 1)
         )
     
+    notified = len(notifications)
     if notified > 0:
         try:
+            # Plain column dicts, inserted in one executemany: no Notification
+            # objects are built, tracked in the session or refreshed
+            db.session.execute(insert(Notification), notifications)
             db.session.commit()
             logger.info(f'Sent {notified} job alert(s) for task {task.id} "{task.title}"')
         except Exception as e:
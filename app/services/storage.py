@@ -8,7 +8,7 @@ Buckets:
 """
 
 import logging
-from uuid import uuid4
+import secrets
 from typing import Optional, Tuple
 from app.services.supabase_client import get_supabase_client
 
@@ -46,8 +46,9 @@ def upload_file(
 
     try:
         # Generate unique filename
-        ext = file_name.rsplit('.', 1)[-1].lower() if '.' in file_name else 'jpg'
-        unique_name = f"{uuid4().hex}.{ext}"
+        _, dot, ext = file_name.rpartition('.')
+        ext = ext.lower() if dot else 'jpg'
+        unique_name = f"{secrets.token_hex(16)}.{ext}"
 
         logger.info(f'Uploading file to {bucket}/{unique_name} ({content_type})')
 
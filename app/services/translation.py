@@ -15,6 +15,9 @@ logger = logging.getLogger(__name__)
 # Supported languages (kept for reference)
 SUPPORTED_LANGUAGES = ['lv', 'en', 'ru']
 
+# Task fields sent for translation
+TASK_TRANSLATABLE_FIELDS = ('title', 'description')
+
 
 def is_translation_enabled() -> bool:
     """Translation is disabled — always returns False."""
@@ -26,6 +29,32 @@ def translate_text(text: str, target_lang: str) -> str:
     return text
 
 
+def translate_texts(texts: list[str], target_lang: str) -> list[str]:
+    """Return original texts unchanged (translation disabled).
+    
+    Batch counterpart of translate_text(). Google and DeepL both accept
+    many strings per request, so a provider implementation should send
+    one request per batch rather than one per text.
+    """
+    return list(texts)
+
+
+def translate_tasks(task_dicts: list[dict], target_lang: str) -> list[dict]:
+    """Translate the text fields of many tasks with one translate_texts() call."""
+    slots = []
+    texts = []
+    for task_dict in task_dicts:
+        for field in TASK_TRANSLATABLE_FIELDS:
+            if task_dict.get(field):
+                slots.append((task_dict, field))
+                texts.append(task_dict[field])
+    
+    if texts:
+        for (task_dict, field), translated in zip(slots, translate_texts(texts, target_lang)):
+            task_dict[field] = translated
+    return task_dicts
+
+
 def translate_task(task_dict: dict, target_lang: str) -> dict:
     """Return task unchanged (translation disabled)."""
     return task_dict
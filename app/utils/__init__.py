@@ -10,7 +10,7 @@ from app.utils.auth import (
     token_required_g,
     token_optional_g
 )
-from app.utils.user_helpers import get_display_name, send_push_safe
+from app.utils.user_helpers import get_display_name, send_push_safe, send_push_background
 
 __all__ = [
     'token_required',
@@ -19,4 +19,5 @@ __all__ = [
     'token_optional_g',
     'get_display_name',
     'send_push_safe',
+    'send_push_background',
 ]
@@ -12,8 +12,8 @@ Users are looked up by the `sub` claim -> User.supabase_user_id.
 
 import os
 import time
-from functools import wraps
-from flask import request, jsonify, current_app, g
+from functools import wraps, lru_cache
+from flask import request, jsonify, current_app, g, has_request_context
 import jwt
 from jwt import PyJWKClient
 
@@ -22,6 +22,12 @@ _jwks_client = None
 _jwks_client_init_time = 0
 _JWKS_CACHE_TTL = 3600  # Re-create client every hour
 
+# Verified token payloads, keyed by (token, key, algorithms)
+_DECODED_TOKEN_CACHE_SIZE = 4096
+
+# WSGI environ key holding this request's (auth_header, resolution)
+_RESOLVED_TOKEN_ENVIRON_KEY = 'marketplace.resolved_token'
+
 
 def _get_supabase_jwt_secret():
     """Get Supabase JWT secret, return None if not configured."""
@@ -45,7 +51,63 @@ def _get_jwks_client():
     return _jwks_client
 
 
+@lru_cache(maxsize=_DECODED_TOKEN_CACHE_SIZE)
+def _verify_token(token, secret, algorithms):
+    """Verify a JWT signature and return its payload (memoized).
+
+    Keyed on hashable values only: secret is the HS* shared secret, or
+    None for asymmetric tokens, whose public key object is not hashable
+    and is looked up from the JWKS (by the token's kid) on a miss.
+    """
+    if secret is None:
+        key = _get_jwks_client().get_signing_key_from_jwt(token).key
+    else:
+        key = secret
+    return jwt.decode(
+        token,
+        key,
+        algorithms=list(algorithms),
+        audience='authenticated',
+    )
+
+
+def _decode_token(token, secret, algorithms):
+    """Decode a JWT, skipping signature verification for tokens seen before.
+
+    The same token is sent on every request of a session, so the verified
+    payload is cached. Expiry is re-checked on each call because a cached
+    entry can outlive the token itself.
+    """
+    payload = _verify_token(token, secret, tuple(algorithms))
+    exp = payload.get('exp')
+    if exp is not None and exp <= time.time():
+        raise jwt.ExpiredSignatureError('Signature has expired')
+    return payload
+
+
 def _resolve_user_from_token(auth_header):
+    """Resolve an Authorization header to a local user_id, once per request.
+
+    The last_seen before_request hook and the route decorator both
+    resolve the same header; the result is kept in the WSGI environ so
+    the second call skips the decode and the user lookup query.
+
+    Returns:
+        (user_id, error_message, status_code), see _resolve_user_uncached.
+    """
+    if not has_request_context():
+        return _resolve_user_uncached(auth_header)
+
+    cached = request.environ.get(_RESOLVED_TOKEN_ENVIRON_KEY)
+    if cached is not None and cached[0] == auth_header:
+        return cached[1]
+
+    result = _resolve_user_uncached(auth_header)
+    request.environ[_RESOLVED_TOKEN_ENVIRON_KEY] = (auth_header, result)
+    return result
+
+
+def _resolve_user_uncached(auth_header):
     """Decode Supabase JWT and resolve to local user_id.
 
     Supports both ES256 (asymmetric, verified via JWKS) and
@@ -78,13 +140,8 @@ def _resolve_user_from_token(auth_header):
                 )
                 return None, 'Server authentication configuration error', 500
 
-            signing_key = jwks_client.get_signing_key_from_jwt(token)
-            payload = jwt.decode(
-                token,
-                signing_key.key,
-                algorithms=[alg],
-                audience='authenticated',
-            )
+            # Public key is fetched from the JWKS inside the verifier
+            payload = _decode_token(token, None, [alg])
         else:
             # Symmetric (HS256/HS384/HS512) — use JWT secret
             supabase_secret = _get_supabase_jwt_secret()
@@ -92,11 +149,10 @@ def _resolve_user_from_token(auth_header):
                 current_app.logger.error('SUPABASE_JWT_SECRET is not configured')
                 return None, 'Server authentication configuration error', 500
 
-            payload = jwt.decode(
+            payload = _decode_token(
                 token,
                 supabase_secret,
-                algorithms=['HS256', 'HS384', 'HS512'],
-                audience='authenticated',
+                ['HS256', 'HS384', 'HS512'],
             )
 
         supabase_uid = payload.get('sub')
@@ -0,0 +1,101 @@
+"""Geohash encoding and bounding-box coverage.
+
+Tasks store the geohash of their coordinates so radius searches can
+pre-filter with a handful of prefix matches (an index range probe)
+instead of two independent range scans on latitude and longitude.
+
+Pure Python, no external dependencies.
+"""
+
+_BASE32 = '0123456789bcdefghjkmnpqrstuvwxyz'
+
+# Precision stored on TaskRequest.geohash (~153m x 153m cells)
+GEOHASH_PRECISION = 7
+
+# Upper bound on prefixes used to cover a search area
+MAX_COVER_CELLS = 32
+
+
+def encode(lat: float, lng: float, precision: int = GEOHASH_PRECISION) -> str:
+    """Encode coordinates as a geohash string of the given length."""
+    lat_lo, lat_hi = -90.0, 90.0
+    lng_lo, lng_hi = -180.0, 180.0
+    chars = []
+    bits = 0
+    bit_count = 0
+    even = True  # Bits alternate lng, lat, lng, ...
+
+    while len(chars) < precision:
+        if even:
+            mid = (lng_lo + lng_hi) / 2
+            if lng >= mid:
+                bits = (bits << 1) | 1
+                lng_lo = mid
+            else:
+                bits <<= 1
+                lng_hi = mid
+        else:
+            mid = (lat_lo + lat_hi) / 2
+            if lat >= mid:
+                bits = (bits << 1) | 1
+                lat_lo = mid
+            else:
+                bits <<= 1
+                lat_hi = mid
+        even = not even
+        bit_count += 1
+        if bit_count == 5:
+            chars.append(_BASE32[bits])
+            bits = 0
+            bit_count = 0
+
+    return ''.join(chars)
+
+
+def _cell_grid(min_lat, max_lat, min_lng, max_lng, precision):
+    """Row and column index ranges of the cells touching a bounding box."""
+    lat_bits = 5 * precision // 2
+    lng_bits = (5 * precision + 1) // 2
+    cell_height = 180.0 / (1 << lat_bits)
+    cell_width = 360.0 / (1 << lng_bits)
+
+    last_row = (1 << lat_bits) - 1
+    rows = range(
+        min(int((max(min_lat, -90.0) + 90.0) // cell_height), last_row),
+        min(int((min(max_lat, 90.0) + 90.0) // cell_height), last_row) + 1
+    )
+    col_count = 1 << lng_bits
+    cols = range(
+        int((min_lng + 180.0) // cell_width),
+        int((max_lng + 180.0) // cell_width) + 1
+    )
+    # A box as wide as the globe (near the poles) needs every column once;
+    # its raw column range can run past 1e14 entries there
+    if cols.stop - cols.start >= col_count:
+        cols = range(col_count)
+    return rows, cols, cell_height, cell_width, col_count
+
+
+def covering_prefixes(min_lat, max_lat, min_lng, max_lng, max_cells=MAX_COVER_CELLS):
+    """Geohash prefixes whose cells together cover a bounding box.
+
+    Picks the longest prefix length that needs at most max_cells cells,
+    so small search areas get tight cells and large ones stay cheap.
+    Every point inside the box has a geohash starting with one of the
+    returned prefixes (the cover is a superset of the box).
+    """
+    for precision in range(GEOHASH_PRECISION, 0, -1):
+        rows, cols, cell_height, cell_width, col_count = _cell_grid(
+            min_lat, max_lat, min_lng, max_lng, precision
+        )
+        if len(rows) * min(len(cols), col_count) <= max_cells or precision == 1:
+            break
+
+    cells = set()
+    for row in rows:
+        cell_lat = -90.0 + (row + 0.5) * cell_height
+        for col in cols:
+            # Wrap columns across the antimeridian
+            cell_lng = -180.0 + ((col % col_count) + 0.5) * cell_width
+            cells.add(encode(cell_lat, cell_lng, precision))
+    return sorted(cells)
@@ -0,0 +1,54 @@
+"""orjson-backed JSON provider for Flask.
+
+jsonify() and request.get_json() go through app.json. Task list
+responses serialize dozens of wide task dicts, and orjson encodes them
+several times faster than the stdlib json module, writing UTF-8 bytes
+straight into the response.
+
+Falls back to Flask's default provider when orjson is not installed.
+"""
+
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson
+    _ORJSON_OPTIONS = (
+        orjson.OPT_NON_STR_KEYS
+        | orjson.OPT_PASSTHROUGH_DATETIME
+        | orjson.OPT_PASSTHROUGH_DATACLASS
+    )
+except ImportError:  # pragma: no cover - optional speedup
+    orjson = None
+
+
+class OrjsonProvider(DefaultJSONProvider):
+    """DefaultJSONProvider with orjson doing the encoding and decoding.
+
+    Datetimes and dataclasses are passed through to Flask's default hook
+    so they serialize exactly as they did with the stdlib provider.
+    Keys are not sorted (orjson keeps insertion order).
+    """
+
+    def _dumps_bytes(self, obj, indent=False) -> bytes:
+        option = _ORJSON_OPTIONS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(obj, default=self.default, option=option)
+
+    def dumps(self, obj, **kwargs) -> str:
+        return self._dumps_bytes(obj, indent=bool(kwargs.get('indent'))).decode('utf-8')
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        indent = (self.compact is None and self._app.debug) or self.compact is False
+        return self._app.response_class(
+            self._dumps_bytes(obj, indent=indent) + b'\n', mimetype=self.mimetype
+        )
+
+
+def get_json_provider_class():
+    """The JSON provider to install on the app (orjson when available)."""
+    return OrjsonProvider if orjson is not None else DefaultJSONProvider
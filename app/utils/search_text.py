@@ -0,0 +1,76 @@
+"""Text normalization for task search.
+
+Search matches patterns against a normalized form of the task text:
+lowercased, Latvian diacritics stripped and Russian ё folded to е.
+TaskRequest.search_text stores that form for title + description, and
+TranslationCache.search_text for each cached translation, so the
+database can do the substring matching.
+"""
+
+from functools import lru_cache
+
+# Latvian diacritics mapping for normalization
+LATVIAN_DIACRITICS = {
+    '\u0101': 'a', '\u010d': 'c', '\u0113': 'e', '\u0123': 'g', '\u012b': 'i', 
+    '\u0137': 'k', '\u013c': 'l', '\u0146': 'n', '\u0161': 's', '\u016b': 'u', 
+    '\u017e': 'z', '\u014d': 'o',
+    # Uppercase versions
+    '\u0100': 'a', '\u010c': 'c', '\u0112': 'e', '\u0122': 'g', '\u012a': 'i',
+    '\u0136': 'k', '\u013b': 'l', '\u0145': 'n', '\u0160': 's', '\u016a': 'u',
+    '\u017d': 'z', '\u014c': 'o',
+}
+
+# Russian common character simplifications (for typos)
+RUSSIAN_SIMPLIFICATIONS = {
+    '\u0451': '\u0435',  # ё -> е
+    '\u0401': '\u0415',  # Ё -> Е
+}
+
+# Substitutions applied after lower(); the uppercase keys can no longer occur
+_LOWERCASE_SUBSTITUTIONS = tuple(
+    (char, replacement)
+    for char, replacement in {**LATVIAN_DIACRITICS, **RUSSIAN_SIMPLIFICATIONS}.items()
+    if char == char.lower()
+)
+
+
+@lru_cache(maxsize=8192)
+def normalize_text(text: str) -> str:
+    """Normalize text by removing diacritics and simplifying characters.
+    
+    Handles:
+    - Latvian: tīrīt → tirit, ābolā → abola
+    - Russian: ёлка → елка
+    - Case: SNOW → snow
+    
+    Memoized on the raw text: search words and cached translations are
+    normalized again on every search request.
+    """
+    if not text:
+        return ''
+    
+    result = text.lower()
+    
+    # Plain ASCII (most English text) has nothing to substitute
+    if result.isascii():
+        return result
+    
+    # Apply Latvian diacritics normalization and Russian simplifications.
+    # Chained replace() beats str.translate() here: translate has no fast
+    # path for non-ASCII input and was ~25x slower on Latvian text.
+    for char, replacement in _LOWERCASE_SUBSTITUTIONS:
+        result = result.replace(char, replacement)
+    
+    return result
+
+
+def build_search_text(title: str | None, description: str | None) -> str:
+    """Normalized title + description, as stored in TaskRequest.search_text."""
+    # Each task text is normalized once on save; bypass the cache so these
+    # one-off strings don't evict the entries searches reuse
+    return normalize_text.__wrapped__(f'{title or ""} {description or ""}')
+
+
+def build_translation_search_text(translated_text: str | None) -> str:
+    """Normalized translation, as stored in TranslationCache.search_text."""
+    return normalize_text.__wrapped__(translated_text or '')
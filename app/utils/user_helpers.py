@@ -55,3 +55,32 @@ def send_push_safe(push_func, *args, **kwargs):
         push_func(*args, **kwargs)
     except Exception as e:
         print(f"Push notification error (non-critical): {e}")
+
+
+def send_push_background(push_func, *args, **kwargs):
+    """
+    Send a push notification without holding up the current request.
+    
+    The push (subscription lookup plus one HTTP call per device) runs as a
+    Socket.IO background task - a greenlet under the production gevent
+    worker - inside its own app context, with send_push_safe's error
+    handling. Under TESTING it runs inline so tests stay deterministic.
+    
+    Args:
+        push_func: The push notification function to call
+        *args: Positional arguments to pass to the function
+        **kwargs: Keyword arguments to pass to the function
+    """
+    from flask import current_app
+    from app import socketio
+    
+    app = current_app._get_current_object()
+    if app.config.get('TESTING', False):
+        send_push_safe(push_func, *args, **kwargs)
+        return
+    
+    def run():
+        with app.app_context():
+            send_push_safe(push_func, *args, **kwargs)
+    
+    socketio.start_background_task(run)
@@ -0,0 +1,74 @@
+"""Add geohash column to task_requests
+
+Revision ID: add_task_geohash
+Revises: add_task_list_indexes
+Create Date: 2026-10-17
+
+Stores the geohash cell of each task so radius searches can pre-filter
+on a single indexed column. Existing rows are backfilled from their
+latitude/longitude. Safe to re-run: the column and index are only
+created when missing and only NULL cells are backfilled.
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy import inspect
+
+from app.utils.geohash import GEOHASH_PRECISION, encode
+
+
+# revision identifiers, used by Alembic.
+revision = 'add_task_geohash'
+down_revision = 'add_task_list_indexes'
+branch_labels = None
+depends_on = None
+
+
+BACKFILL_BATCH_SIZE = 1000
+
+
+def column_exists(table_name, column_name):
+    """Check if a column exists in a table."""
+    bind = op.get_bind()
+    inspector = inspect(bind)
+    columns = [col['name'] for col in inspector.get_columns(table_name)]
+    return column_name in columns
+
+
+def index_exists(table_name, index_name):
+    """Check if an index exists on a table."""
+    bind = op.get_bind()
+    inspector = inspect(bind)
+    return index_name in [idx['name'] for idx in inspector.get_indexes(table_name)]
+
+
+def upgrade():
+    if not column_exists('task_requests', 'geohash'):
+        op.add_column('task_requests', sa.Column('geohash', sa.String(GEOHASH_PRECISION), nullable=True))
+    else:
+        print("Column 'geohash' already exists in task_requests")
+    
+    bind = op.get_bind()
+    select_batch = sa.text(
+        'SELECT id, latitude, longitude FROM task_requests '
+        'WHERE geohash IS NULL AND latitude IS NOT NULL AND longitude IS NOT NULL '
+        'ORDER BY id LIMIT :limit'
+    )
+    update = sa.text('UPDATE task_requests SET geohash = :geohash WHERE id = :id')
+    while True:
+        rows = bind.execute(select_batch, {'limit': BACKFILL_BATCH_SIZE}).fetchall()
+        if not rows:
+            break
+        bind.execute(update, [
+            {'id': row.id, 'geohash': encode(row.latitude, row.longitude)}
+            for row in rows
+        ])
+    
+    if not index_exists('task_requests', 'ix_task_requests_geohash'):
+        op.create_index('ix_task_requests_geohash', 'task_requests', ['geohash'])
+
+
+def downgrade():
+    if index_exists('task_requests', 'ix_task_requests_geohash'):
+        op.drop_index('ix_task_requests_geohash', table_name='task_requests')
+    if column_exists('task_requests', 'geohash'):
+        op.drop_column('task_requests', 'geohash')
@@ -0,0 +1,54 @@
+"""Index task geohash for prefix searches
+
+Revision ID: add_task_geohash_pattern_index
+Revises: add_task_geohash
+Create Date: 2026-10-17
+
+Radius searches filter with geohash LIKE 'prefix%' plus a status
+check. A plain b-tree on geohash only serves LIKE on PostgreSQL when
+the database collation is C, so this replaces ix_task_requests_geohash
+with a (geohash varchar_pattern_ops, status) index that does.
+
+On PostgreSQL the index is built CONCURRENTLY so the table stays
+writable during the deploy. Safe to re-run.
+"""
+from alembic import op
+from sqlalchemy import inspect
+
+
+# revision identifiers, used by Alembic.
+revision = 'add_task_geohash_pattern_index'
+down_revision = 'add_task_geohash'
+branch_labels = None
+depends_on = None
+
+
+def index_exists(table_name, index_name):
+    """Check if an index exists on a table."""
+    bind = op.get_bind()
+    inspector = inspect(bind)
+    return index_name in [idx['name'] for idx in inspector.get_indexes(table_name)]
+
+
+def upgrade():
+    if index_exists('task_requests', 'ix_task_requests_geohash_status'):
+        print("Index 'ix_task_requests_geohash_status' already exists")
+    elif op.get_bind().dialect.name == 'postgresql':
+        with op.get_context().autocommit_block():
+            op.execute(
+                'CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_task_requests_geohash_status '
+                'ON task_requests (geohash varchar_pattern_ops, status)'
+            )
+    else:
+        op.create_index('ix_task_requests_geohash_status', 'task_requests', ['geohash', 'status'])
+    
+    # Superseded: the new index leads with geohash
+    if index_exists('task_requests', 'ix_task_requests_geohash'):
+        op.drop_index('ix_task_requests_geohash', table_name='task_requests')
+
+
+def downgrade():
+    if not index_exists('task_requests', 'ix_task_requests_geohash'):
+        op.create_index('ix_task_requests_geohash', 'task_requests', ['geohash'])
+    if index_exists('task_requests', 'ix_task_requests_geohash_status'):
+        op.drop_index('ix_task_requests_geohash_status', table_name='task_requests')
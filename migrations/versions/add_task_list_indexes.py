@@ -0,0 +1,64 @@
+"""Add composite indexes for the task list queries
+
+Revision ID: add_task_list_indexes
+Revises: add_onboarding_fields
+Create Date: 2026-10-17
+
+Indexes backing GET /api/tasks:
+- task_requests (status, category) for the feed filter
+- task_applications (task_id, status) WHERE status = 'pending' for the
+  per-task pending count subquery (partial on PostgreSQL)
+- task_applications (applicant_id, task_id) for the has_applied EXISTS
+
+On PostgreSQL the indexes are built CONCURRENTLY so the tables stay
+writable during the deploy. Existing indexes are skipped, so the
+migration is safe to re-run.
+"""
+from alembic import op
+from sqlalchemy import inspect
+
+
+# revision identifiers, used by Alembic.
+revision = 'add_task_list_indexes'
+down_revision = 'add_onboarding_fields'
+branch_labels = None
+depends_on = None
+
+
+INDEXES = [
+    ('ix_task_requests_status_category', 'task_requests', ['status', 'category'], None),
+    ('ix_task_applications_task_status', 'task_applications', ['task_id', 'status'], "status = 'pending'"),
+    ('ix_task_applications_applicant_task', 'task_applications', ['applicant_id', 'task_id'], None),
+]
+
+
+def index_exists(table_name, index_name):
+    """Check if an index exists on a table."""
+    bind = op.get_bind()
+    inspector = inspect(bind)
+    return index_name in [idx['name'] for idx in inspector.get_indexes(table_name)]
+
+
+def upgrade():
+    is_postgres = op.get_bind().dialect.name == 'postgresql'
+    
+    for name, table, columns, where in INDEXES:
+        if index_exists(table, name):
+            print(f"Index '{name}' already exists")
+            continue
+        
+        if is_postgres:
+            where_clause = f' WHERE {where}' if where else ''
+            with op.get_context().autocommit_block():
+                op.execute(
+                    f'CREATE INDEX CONCURRENTLY IF NOT EXISTS {name} '
+                    f'ON {table} ({", ".join(columns)}){where_clause}'
+                )
+        else:
+            op.create_index(name, table, columns)
+
+
+def downgrade():
+    for name, table, columns, where in reversed(INDEXES):
+        if index_exists(table, name):
+            op.drop_index(name, table_name=table)
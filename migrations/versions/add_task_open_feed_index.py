@@ -0,0 +1,55 @@
+"""Add partial index for the open-task feed
+
+Revision ID: add_task_open_feed_index
+Revises: add_translation_search_text
+Create Date: 2026-10-17
+
+The feed, search and "tasks by user" lists all read open tasks,
+optionally of one category, newest first. A partial index on
+(category, created_at DESC) WHERE status = 'open' covers only the open
+rows - a fraction of the table once tasks complete - and hands them
+back already in created_at order.
+
+On PostgreSQL the index is built CONCURRENTLY so task_requests stays
+writable during the deploy. Safe to re-run.
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy import inspect
+
+
+# revision identifiers, used by Alembic.
+revision = 'add_task_open_feed_index'
+down_revision = 'add_translation_search_text'
+branch_labels = None
+depends_on = None
+
+
+INDEX_NAME = 'ix_task_requests_open_feed'
+
+
+def index_exists(table_name, index_name):
+    """Check if an index exists on a table."""
+    bind = op.get_bind()
+    inspector = inspect(bind)
+    return index_name in [idx['name'] for idx in inspector.get_indexes(table_name)]
+
+
+def upgrade():
+    if index_exists('task_requests', INDEX_NAME):
+        print(f"Index '{INDEX_NAME}' already exists")
+        return
+    
+    if op.get_bind().dialect.name == 'postgresql':
+        with op.get_context().autocommit_block():
+            op.execute(
+                f'CREATE INDEX CONCURRENTLY IF NOT EXISTS {INDEX_NAME} '
+                "ON task_requests (category, created_at DESC) WHERE status = 'open'"
+            )
+    else:
+        op.create_index(INDEX_NAME, 'task_requests', ['category', sa.text('created_at DESC')])
+
+
+def downgrade():
+    if index_exists('task_requests', INDEX_NAME):
+        op.drop_index(INDEX_NAME, table_name='task_requests')
@@ -0,0 +1,90 @@
+"""Add normalized search_text column to task_requests
+
+Revision ID: add_task_search_text
+Revises: add_task_geohash_pattern_index
+Create Date: 2026-10-17
+
+Task search matches diacritic-insensitive substrings of the title and
+description. search_text stores that normalized form (see
+app.utils.search_text) so the match runs as a LIKE in the database
+instead of loading every task into Python.
+
+Existing rows are backfilled in batches. On PostgreSQL a pg_trgm GIN
+index is built CONCURRENTLY so '%pattern%' matches use an index; if
+the extension cannot be created the column still works, unindexed.
+Safe to re-run.
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy import inspect
+
+from app.utils.search_text import build_search_text
+
+
+# revision identifiers, used by Alembic.
+revision = 'add_task_search_text'
+down_revision = 'add_task_geohash_pattern_index'
+branch_labels = None
+depends_on = None
+
+
+BACKFILL_BATCH_SIZE = 500
+TRGM_INDEX = 'ix_task_requests_search_text_trgm'
+
+
+def column_exists(table_name, column_name):
+    """Check if a column exists in a table."""
+    bind = op.get_bind()
+    inspector = inspect(bind)
+    columns = [col['name'] for col in inspector.get_columns(table_name)]
+    return column_name in columns
+
+
+def index_exists(table_name, index_name):
+    """Check if an index exists on a table."""
+    bind = op.get_bind()
+    inspector = inspect(bind)
+    return index_name in [idx['name'] for idx in inspector.get_indexes(table_name)]
+
+
+def upgrade():
+    if not column_exists('task_requests', 'search_text'):
+        op.add_column('task_requests', sa.Column('search_text', sa.Text(), nullable=True))
+    else:
+        print("Column 'search_text' already exists in task_requests")
+    
+    bind = op.get_bind()
+    select_batch = sa.text(
+        'SELECT id, title, description FROM task_requests '
+        'WHERE search_text IS NULL ORDER BY id LIMIT :limit'
+    )
+    update = sa.text('UPDATE task_requests SET search_text = :search_text WHERE id = :id')
+    while True:
+        rows = bind.execute(select_batch, {'limit': BACKFILL_BATCH_SIZE}).fetchall()
+        if not rows:
+            break
+        bind.execute(update, [
+            {'id': row.id, 'search_text': build_search_text(row.title, row.description)}
+            for row in rows
+        ])
+    
+    if bind.dialect.name != 'postgresql' or index_exists('task_requests', TRGM_INDEX):
+        return
+    
+    with op.get_context().autocommit_block():
+        try:
+            op.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+        except Exception as e:
+            print(f"pg_trgm not available, search_text left unindexed: {e}")
+            return
+        op.execute(
+            f'CREATE INDEX CONCURRENTLY IF NOT EXISTS {TRGM_INDEX} '
+            'ON task_requests USING gin (search_text gin_trgm_ops)'
+        )
+
+
+def downgrade():
+    if index_exists('task_requests', TRGM_INDEX):
+        op.drop_index(TRGM_INDEX, table_name='task_requests')
+    if column_exists('task_requests', 'search_text'):
+        op.drop_column('task_requests', 'search_text')
@@ -172,3 +172,36 @@ class TestPublicUserProfile:
         response = client.get('/api/auth/users/99999')
         
         assert response.status_code == 404
+
+
+class TestSupabaseTokens:
+    """Tests for Supabase JWT verification"""
+    
+    def test_es256_token_verified_via_jwks(self, app, test_user, monkeypatch):
+        """Test that an ES256 token is verified with the key from the JWKS."""
+        import time
+        import jwt
+        from types import SimpleNamespace
+        from cryptography.hazmat.primitives.asymmetric import ec
+        from app import db
+        from app.models import User
+        from app.utils import auth
+        
+        private_key = ec.generate_private_key(ec.SECP256R1())
+        jwks_client = SimpleNamespace(
+            get_signing_key_from_jwt=lambda token: SimpleNamespace(key=private_key.public_key())
+        )
+        monkeypatch.setattr(auth, '_get_jwks_client', lambda: jwks_client)
+        
+        token = jwt.encode(
+            {'sub': 'es256-sub', 'aud': 'authenticated', 'exp': int(time.time()) + 300},
+            private_key, algorithm='ES256', headers={'kid': 'test-key'},
+        )
+        
+        with app.app_context():
+            db.session.get(User, test_user['id']).supabase_user_id = 'es256-sub'
+            db.session.commit()
+            
+            # Second call is served from the verified-token cache
+            for _ in range(2):
+                assert auth._resolve_user_uncached(f'Bearer {token}') == (test_user['id'], None, None)
@@ -3,6 +3,7 @@ Tests for tasks endpoints.
 """
 
 import pytest
+from math import radians, sin, cos, sqrt, atan2
 from faker import Faker
 
 fake = Faker()
@@ -32,6 +33,59 @@ class TestListTasks:
         
         assert response.status_code == 200
     
+    def test_list_tasks_distance_sorted(self, client, test_task):
+        """Test that location queries return the distance to each task."""
+        response = client.get('/api/tasks?latitude=56.9496&longitude=24.1052&radius=10&min_results=0')
+        
+        assert response.status_code == 200
+        tasks = response.json['tasks']
+        assert len(tasks) >= 1
+        assert tasks[0]['distance'] == 0
+        assert response.json['radius_expanded'] is False
+    
+    def test_list_tasks_radius_expansion(self, client, test_task):
+        """Test that the radius expands until min_results tasks are found."""
+        # Tartu is ~200 km from the Riga test task
+        response = client.get(
+            '/api/tasks?latitude=58.3780&longitude=26.7290&radius=25&min_results=1'
+        )
+        
+        assert response.status_code == 200
+        assert response.json['radius_expanded'] is True
+        assert response.json['effective_radius'] in (200, 500)
+        assert len(response.json['tasks']) >= 1
+    
+    def test_list_tasks_at_pole(self, app, client, test_user):
+        """Test that a search centred on a pole returns nearby tasks promptly."""
+        from app import db
+        from app.models import TaskRequest
+        
+        with app.app_context():
+            # ~5.6 km from the North Pole, on the far side of the globe in longitude
+            task = TaskRequest(
+                title='Polar task', description='Ice', category='cleaning',
+                location='North Pole', latitude=89.95, longitude=-150.0,
+                creator_id=test_user['id'],
+            )
+            db.session.add(task)
+            db.session.commit()
+            task_id = task.id
+        
+        response = client.get('/api/tasks?latitude=90&longitude=24&radius=10&min_results=0')
+        
+        assert response.status_code == 200
+        assert [t['id'] for t in response.json['tasks']] == [task_id]
+    
+    def test_list_tasks_rejects_out_of_range_coordinates(self, client, db_session):
+        """Test that coordinates outside latitude/longitude range are rejected."""
+        response = client.get('/api/tasks?latitude=91&longitude=24')
+        
+        assert response.status_code == 400
+        
+        response = client.get('/api/tasks/search?q=snow&latitude=56.9&longitude=-181')
+        
+        assert response.status_code == 400
+    
     def test_list_tasks_by_category(self, client, test_task):
         """Test filtering tasks by category."""
         response = client.get('/api/tasks?category=cleaning')
@@ -39,6 +93,153 @@ class TestListTasks:
         assert response.status_code == 200
 
 
+class TestDistanceHelpers:
+    """Tests for the Haversine distance helper"""
+    
+    @pytest.mark.parametrize('points', [
+        (56.9496, 24.1052, 56.9496, 24.1052),   # same point
+        (56.9496, 24.1052, 58.3780, 26.7290),   # Riga -> Tartu
+        (56.9496, 24.1052, 51.5074, -0.1278),   # Riga -> London
+        (0.0, 0.0, 0.0, 179.9999),              # near-antipodal
+        (-33.8688, 151.2093, 40.7128, -74.0060),
+    ])
+    def test_distance_matches_atan2_form(self, points):
+        """Test that the asin form matches the original atan2 Haversine."""
+        from app.routes.tasks.helpers import distance, EARTH_RADIUS_KM
+        
+        lat1, lon1, lat2, lon2 = map(radians, points)
+        a = sin((lat2 - lat1) / 2)**2 + cos(lat1) * cos(lat2) * sin((lon2 - lon1) / 2)**2
+        expected = EARTH_RADIUS_KM * 2 * atan2(sqrt(a), sqrt(1 - a))
+        
+        assert distance(*points) == pytest.approx(expected, abs=1e-9)
+    
+    def test_distance_expr_antipodal(self, app, test_user):
+        """Test that the SQL Haversine handles an exactly antipodal task."""
+        from math import pi
+        from app import db
+        from app.models import TaskRequest
+        from app.routes.tasks.helpers import distance_expr, EARTH_RADIUS_KM
+        
+        with app.app_context():
+            # The Haversine term a comes out as 1.0000000000000002 for this pair
+            task = TaskRequest(
+                title='Far away', description='Antipode', category='cleaning',
+                location='Pacific', latitude=9.8575, longitude=-24.06,
+                creator_id=test_user['id'],
+            )
+            db.session.add(task)
+            db.session.commit()
+            
+            dist = db.session.query(distance_expr(-9.8575, 155.94)).filter(
+                TaskRequest.id == task.id
+            ).scalar()
+            
+            assert dist == pytest.approx(pi * EARTH_RADIUS_KM)
+
+
+class TestPendingApplicationCounts:
+    """Tests for the batched pending application count helper"""
+    
+    def test_counts_only_pending(self, app, test_task, second_user):
+        """Test that only pending applications are counted, per task."""
+        from app import db
+        from app.models import TaskApplication
+        from app.routes.tasks.helpers import get_pending_applications_counts
+        
+        with app.app_context():
+            db.session.add(TaskApplication(
+                task_id=test_task['id'], applicant_id=second_user['id'], status='pending'
+            ))
+            db.session.commit()
+            
+            counts = get_pending_applications_counts([test_task['id'], test_task['id'] + 1])
+            
+            assert counts == {test_task['id']: 1}
+            assert get_pending_applications_counts([]) == {}
+
+
+class TestSearchTasks:
+    """Tests for GET /api/tasks/search"""
+    
+    def test_search_ignores_diacritics_and_like_wildcards(self, app, client, test_user):
+        """Test that search matches without diacritics and treats % and _ literally."""
+        from app import db
+        from app.models import TaskRequest
+        
+        with app.app_context():
+            task = TaskRequest(
+                title='Tīrīt sniegu', description='Pagalmā', category='cleaning',
+                location='Riga, Latvia', latitude=56.9496, longitude=24.1052,
+                creator_id=test_user['id'],
+            )
+            db.session.add(task)
+            db.session.commit()
+            task_id = task.id
+        
+        response = client.get('/api/tasks/search?q=tirit')
+        assert response.status_code == 200
+        assert [t['id'] for t in response.json['tasks']] == [task_id]
+        
+        response = client.get('/api/tasks/search', query_string={'q': 'ti%t'})
+        assert response.status_code == 200
+        assert response.json['tasks'] == []
+    
+    def test_search_matches_cached_translation(self, app, client, test_user):
+        """Test that a task is found through the cached translation of its title."""
+        from app import db
+        from app.models import TaskRequest, TranslationCache
+        
+        with app.app_context():
+            task = TaskRequest(
+                title='Tīrīt sniegu', description='Pagalmā', category='cleaning',
+                location='Riga, Latvia', latitude=56.9496, longitude=24.1052,
+                creator_id=test_user['id'],
+            )
+            db.session.add(task)
+            db.session.add(TranslationCache(
+                text_hash='tirit-sniegu', source_lang='lv', target_lang='en',
+                original_text='Tīrīt sniegu', translated_text='Clear SNOW',
+            ))
+            db.session.commit()
+            task_id = task.id
+        
+        response = client.get('/api/tasks/search?q=snow')
+        assert response.status_code == 200
+        assert [t['id'] for t in response.json['tasks']] == [task_id]
+    
+    def test_search_response_cached_until_write(self, app, client, test_task, monkeypatch):
+        """Test that repeated searches hit the cache until a committed ORM write."""
+        from app import db
+        from app.models import TaskRequest
+        from app.routes.tasks import search
+        
+        monkeypatch.setitem(app.config, 'SEARCH_CACHE_TTL_SECONDS', 60)
+        search._search_cache.clear()
+        url = '/api/tasks/search?q=cleaning&status=open'
+        
+        with app.app_context():
+            db.session.execute(db.text(
+                "UPDATE task_requests SET title = 'Cleaning help', search_text = 'cleaning help' WHERE id = :id"
+            ), {'id': test_task['id']})
+            db.session.commit()
+        assert [t['title'] for t in client.get(url).json['tasks']] == ['Cleaning help']
+        
+        # Raw SQL bypasses invalidation: the cached response is served
+        with app.app_context():
+            db.session.execute(db.text(
+                "UPDATE task_requests SET title = 'Cleaning now' WHERE id = :id"
+            ), {'id': test_task['id']})
+            db.session.commit()
+        assert [t['title'] for t in client.get(url).json['tasks']] == ['Cleaning help']
+        
+        # A committed ORM write invalidates it
+        with app.app_context():
+            db.session.get(TaskRequest, test_task['id']).title = 'Cleaning today'
+            db.session.commit()
+        assert [t['title'] for t in client.get(url).json['tasks']] == ['Cleaning today']
+        search._search_cache.clear()
+
+
 class TestGetTask:
     """Tests for GET /api/tasks/:id"""
     
@@ -103,6 +304,37 @@ class TestCreateTask:
         
         # May be accepted with null location or rejected
         assert response.status_code in [201, 400, 422]
+    
+    def test_create_task_string_coordinates(self, app, client, test_user, monkeypatch):
+        """Test creating a task whose coordinates arrive as JSON strings."""
+        import time
+        import jwt
+        from app import db
+        from app.models import TaskRequest, User
+        
+        monkeypatch.setenv('SUPABASE_JWT_SECRET', 'test-supabase-secret')
+        with app.app_context():
+            db.session.get(User, test_user['id']).supabase_user_id = 'string-coords-sub'
+            db.session.commit()
+        token = jwt.encode(
+            {'sub': 'string-coords-sub', 'aud': 'authenticated', 'exp': int(time.time()) + 300},
+            'test-supabase-secret', algorithm='HS256',
+        )
+        data = {
+            'title': fake.sentence(nb_words=4),
+            'description': fake.paragraph(),
+            'category': 'cleaning',
+            'location': 'Riga, Latvia',
+            'latitude': '56.9496',
+            'longitude': '24.1052',
+        }
+        
+        response = client.post('/api/tasks', json=data, headers={'Authorization': f'Bearer {token}'})
+        
+        assert response.status_code == 201
+        with app.app_context():
+            task = db.session.get(TaskRequest, response.json['task']['id'])
+            assert task.geohash == 'ud15ux2'
 
 
 class TestUpdateTask: